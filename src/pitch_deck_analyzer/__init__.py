@@ -1,4 +1,10 @@
-from .crew import PitchDeckCrew
-
 __version__ = "0.1.0"
-__all__ = ["PitchDeckCrew"]
\ No newline at end of file
+__all__ = ["PitchDeckCrew"]
+
+
+def __getattr__(name):
+    # The crew pulls in crewai; load it only when it is actually used
+    if name == "PitchDeckCrew":
+        from .crew import PitchDeckCrew
+        return PitchDeckCrew
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,17 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import Optional
 import os
+import asyncio
+import time
+import argparse
 from datetime import datetime
-from .crew import PitchDeckCrew
+from .job_queue import JobQueue
+from .exports import ReportExporter, EXPORT_FORMATS
+from .blob_store import BlobStore
+from .storage import new_id
 
 app = FastAPI(
     title="Pitch Deck Analyzer API",
@@ -20,43 +27,130 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-crew = PitchDeckCrew()
+# Analyses run in separate worker processes (see worker.py) that share this queue
+queue = JobQueue()
+# Workers render exports when an analysis finishes; this only fills gaps
+exporter = ReportExporter()
+blobs = BlobStore()
+
+JOB_POLL_INTERVAL = 1.0
+# A waiting request gives up after this long and returns the job id to poll instead
+DEFAULT_MAX_WAIT_SECONDS = 300
 
 class AnalysisRequest(BaseModel):
     company_name: str
     website_url: Optional[str] = None
 
+@app.on_event("startup")
+def start_upload_gc():
+    """Keep the shared uploads directory within its quotas."""
+    blobs.start_gc()
+
 @app.post("/analyze")
 async def analyze_pitch_deck(
+    request: Request,
     file: UploadFile = File(...),
     company_name: str = None,
-    website_url: Optional[str] = None
+    website_url: Optional[str] = None,
+    wait: bool = True,
+    timeout: Optional[float] = None,
+    max_wait: Optional[float] = None
 ):
-    """Analyze a pitch deck and return the results."""
+    """Queue a pitch deck analysis and, unless ``wait`` is false, return its results.
+
+    ``timeout`` (seconds, counted from now) bounds the whole analysis; a
+    waiting client that disconnects cancels it. A request waits at most
+    ``max_wait`` seconds (``PITCH_DECK_API_MAX_WAIT``, default 300), then
+    returns the still-queued job's id to poll with ``GET /jobs/{job_id}``.
+    """
     try:
-        os.makedirs("uploads", exist_ok=True)
-        file_path = os.path.join("uploads", file.filename)
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        
-        result = crew.analyze_pitch_deck(
-            pitch_deck_path=file_path,
-            company_name=company_name,
-            website_url=website_url
-        )
-        
-        return result
-    
+        job_id = new_id()
+        content = await file.read()
+        # Stored once per distinct deck; the worker releases the job's reference
+        blob = await asyncio.to_thread(blobs.put, content, file.filename, f"job:{job_id}")
+
+        await asyncio.to_thread(queue.enqueue, {
+            "pitch_deck_path": blob.path,
+            "company_name": company_name,
+            "website_url": website_url,
+            "deadline_at": time.time() + timeout if timeout else None
+        }, job_id)
+
+        if not wait:
+            return {"status": "queued", "job_id": job_id}
+
+        max_wait = max_wait or float(os.getenv("PITCH_DECK_API_MAX_WAIT") or DEFAULT_MAX_WAIT_SECONDS)
+        give_up_at = time.monotonic() + max_wait
+        while time.monotonic() < give_up_at:
+            job = await asyncio.to_thread(queue.get, job_id)
+            if job.finished:
+                return {**(job.result or {"status": job.status}), "job_id": job_id}
+            if await request.is_disconnected():
+                await asyncio.to_thread(queue.cancel, job_id)
+                return {"status": "cancelled", "job_id": job_id}
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+        # Still "queued" when no worker is running, e.g. under plain uvicorn
+        return {"status": job.status, "job_id": job_id}
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Return the status, and once finished the result, of a queued analysis."""
+    job = await asyncio.to_thread(queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return {"job_id": job.id, "status": job.status, "result": job.result}
+
+@app.get("/jobs/{job_id}/report/{fmt}")
+async def download_report(job_id: str, fmt: str):
+    """Stream a finished report as Markdown, HTML, PDF or JSON."""
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=404, detail=f"Unknown format: {fmt}. Available: {', '.join(EXPORT_FORMATS)}")
+    job = await asyncio.to_thread(queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if not job.result or not job.result.get("report_path"):
+        raise HTTPException(status_code=404, detail=f"No report available for job {job_id} ({job.status})")
+
+    exports = await asyncio.to_thread(exporter.ensure, job.result)
+    export = exports[fmt]
+    return FileResponse(
+        export.path,
+        media_type=export.media_type,
+        filename=export.download_name(job.result.get("company_name", ""), job.result.get("timestamp", "")),
+        headers={"ETag": f'"{export.sha256}"'}
+    )
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Stop a queued or running analysis; completed sections are kept in its result."""
+    if await asyncio.to_thread(queue.get, job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    await asyncio.to_thread(queue.cancel, job_id)
+    return {"job_id": job_id, "status": "cancel_requested"}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": datetime.now().isoformat(), "queued_jobs": await asyncio.to_thread(queue.depth)}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    from .worker import WorkerPool
+
+    parser = argparse.ArgumentParser(description="Run the Pitch Deck Analyzer API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--api-workers", type=int, default=2, help="Number of API processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of analysis worker processes")
+    args = parser.parse_args()
+
+    # Start the warm worker pool and its fork server before uvicorn starts its own processes
+    pool = WorkerPool(args.workers)
+    pool.start()
+    try:
+        uvicorn.run(f"{__package__}.api:app", host=args.host, port=args.port, workers=args.api_workers)
+    finally:
+        pool.stop()
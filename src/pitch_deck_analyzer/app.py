@@ -8,6 +8,17 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.insert(0, project_root)
 
 from src.pitch_deck_analyzer.crew import PitchDeckCrew
+from src.pitch_deck_analyzer.runner import AnalysisRunner, analysis_key
+from src.pitch_deck_analyzer.blob_store import BlobStore
+from src.pitch_deck_analyzer.history import AnalysisHistory, load_report
+from src.pitch_deck_analyzer.exports import read_export
+
+PROGRESS_POLL_SECONDS = 1.0
+# Sections render_report lays out; reports missing any of them are shown as plain Markdown
+REPORT_SECTIONS = (
+    '## COMPANY ANALYSIS', '## MARKET ANALYSIS', '## COMPETITIVE LANDSCAPE', '## FINANCIAL ANALYSIS',
+    '## RISK ASSESSMENT', '## DIGITAL PRESENCE AUDIT', '## INVESTMENT RECOMMENDATION', '## NEXT STEPS'
+)
 
 def check_api_keys():
     """Check if required API keys are set."""
@@ -17,12 +28,211 @@ def check_api_keys():
         return False
     return True
 
+@st.cache_resource
 def initialize_crew():
-    """Initialize the PitchDeckCrew"""
-    if not check_api_keys():
-        st.stop()
+    """Initialize the PitchDeckCrew once per server process, shared by all sessions"""
     return PitchDeckCrew()
 
+@st.cache_resource
+def get_runner():
+    """Background analysis runner shared by all sessions"""
+    return AnalysisRunner()
+
+@st.cache_resource
+def get_blob_store():
+    """Deduplicated upload store, garbage-collected in the background"""
+    store = BlobStore()
+    store.start_gc()
+    return store
+
+# Reports and exports never change once written, so a few of each are kept per server
+CACHED_FILES = 16
+
+@st.cache_data(max_entries=CACHED_FILES)
+def get_export_bytes(sha256, _export):
+    """Bytes of an export, read once per content hash"""
+    return read_export(_export)
+
+@st.cache_data(max_entries=CACHED_FILES)
+def get_report(report_path):
+    """Body of a saved report, read once per report"""
+    return load_report(report_path)
+
+def render_report(result, content):
+    """Render a successful analysis result and its report body as a formatted report."""
+    # Create a container for the report
+    report_container = st.container()
+    with report_container:
+        st.markdown("""
+            <style>
+            .report-header {
+                background-color: #f0f2f6;
+                padding: 20px;
+                border-radius: 10px;
+                margin-bottom: 20px;
+            }
+            .section-header {
+                color: #1f77b4;
+                border-bottom: 2px solid #1f77b4;
+                padding-bottom: 5px;
+                margin-top: 20px;
+            }
+            .highlight-box {
+                background-color: #e6f3ff;
+                padding: 15px;
+                border-radius: 5px;
+                margin: 10px 0;
+            }
+            .risk-box {
+                background-color: #fff3e6;
+                padding: 15px;
+                border-radius: 5px;
+                margin: 10px 0;
+            }
+            .recommendation-box {
+                background-color: #e6ffe6;
+                padding: 15px;
+                border-radius: 5px;
+                margin: 10px 0;
+            }
+            </style>
+        """, unsafe_allow_html=True)
+        
+        # Report Header
+        st.markdown(f"""
+            <div class="report-header">
+                <h1 style="text-align: center; color: #1f77b4;">INVESTMENT ANALYSIS REPORT</h1>
+                <p style="text-align: center;">Generated for: {result.get('company_name', 'N/A')}</p>
+                <p style="text-align: center;">Date: {result['timestamp']}</p>
+            </div>
+        """, unsafe_allow_html=True)
+        
+        # Executive Summary
+        st.markdown('<h2 class="section-header">EXECUTIVE SUMMARY</h2>', unsafe_allow_html=True)
+        exec_summary = content.split('## COMPANY ANALYSIS')[0]
+        # The stored report opens with a title block the header above already shows
+        exec_summary = "\n".join(
+            line for line in exec_summary.splitlines()
+            if not line.startswith(("# Investment Analysis Report", "## Company:", "## Generated:"))
+        )
+        st.markdown(exec_summary)
+        
+        # Company Analysis
+        st.markdown('<h2 class="section-header">COMPANY ANALYSIS</h2>', unsafe_allow_html=True)
+        company_analysis = content.split('## COMPANY ANALYSIS')[1].split('## MARKET ANALYSIS')[0]
+        st.markdown(company_analysis)
+        
+        # Market Analysis
+        st.markdown('<h2 class="section-header">MARKET ANALYSIS</h2>', unsafe_allow_html=True)
+        market_analysis = content.split('## MARKET ANALYSIS')[1].split('## COMPETITIVE LANDSCAPE')[0]
+        st.markdown(market_analysis)
+        
+        # Competitive Landscape
+        st.markdown('<h2 class="section-header">COMPETITIVE LANDSCAPE</h2>', unsafe_allow_html=True)
+        competitive = content.split('## COMPETITIVE LANDSCAPE')[1].split('## FINANCIAL ANALYSIS')[0]
+        st.markdown(competitive)
+        
+        # Financial Analysis
+        st.markdown('<h2 class="section-header">FINANCIAL ANALYSIS</h2>', unsafe_allow_html=True)
+        financial = content.split('## FINANCIAL ANALYSIS')[1].split('## RISK ASSESSMENT')[0]
+        st.markdown(financial)
+        
+        # Risk Assessment
+        st.markdown('<h2 class="section-header">RISK ASSESSMENT</h2>', unsafe_allow_html=True)
+        risk = content.split('## RISK ASSESSMENT')[1].split('## DIGITAL PRESENCE AUDIT')[0]
+        st.markdown(f'<div class="risk-box">{risk}</div>', unsafe_allow_html=True)
+        
+        # Digital Presence Audit
+        st.markdown('<h2 class="section-header">DIGITAL PRESENCE AUDIT</h2>', unsafe_allow_html=True)
+        digital = content.split('## DIGITAL PRESENCE AUDIT')[1].split('## INVESTMENT RECOMMENDATION')[0]
+        st.markdown(digital)
+        
+        # Investment Recommendation
+        st.markdown('<h2 class="section-header">INVESTMENT RECOMMENDATION</h2>', unsafe_allow_html=True)
+        recommendation = content.split('## INVESTMENT RECOMMENDATION')[1].split('## NEXT STEPS')[0]
+        st.markdown(f'<div class="recommendation-box">{recommendation}</div>', unsafe_allow_html=True)
+        
+        # Next Steps
+        st.markdown('<h2 class="section-header">NEXT STEPS</h2>', unsafe_allow_html=True)
+        next_steps = content.split('## NEXT STEPS')[1]
+        st.markdown(next_steps)
+        
+        # Download button
+        st.markdown("---")
+        if 'report_path' in result:
+            render_downloads(result)
+
+def render_downloads(result):
+    """Offer every pre-rendered export format, each rendered once per report."""
+    exports = initialize_crew().exporter.ensure(result)
+    for column, export in zip(st.columns(len(exports) or 1), exports.values()):
+        column.download_button(
+            label=f"📥 Download {export.format.upper()}",
+            data=get_export_bytes(export.sha256, export),
+            file_name=export.download_name(result['company_name'], result['timestamp']),
+            mime=export.media_type,
+            key=f"download_{export.sha256}"
+        )
+
+@st.fragment(run_every=PROGRESS_POLL_SECONDS)
+def show_progress(job_id, runner):
+    """Refresh a running job's progress without rerunning the whole page.
+
+    Polling also tells the runner this session is still waiting; once the
+    job finishes the whole page reruns to show the result.
+    """
+    job = runner.get(job_id)
+    if job is None:
+        return
+    if job.done:
+        st.rerun()
+    st.info(f"Analyzing pitch deck... ({job.stage})")
+    st.progress(job.fraction)
+    if st.button("Cancel Analysis"):
+        runner.cancel(job_id)
+
+@st.fragment(run_every=PROGRESS_POLL_SECONDS)
+def show_running_status(job_id, runner):
+    """Keep a running job alive from other pages, refreshing only this status line."""
+    job = runner.get(job_id)
+    if job is None:
+        return
+    if job.done:
+        st.success("Analysis finished. Open Analyze Pitch Deck to see it.")
+    else:
+        st.info(f"Analysis running: {job.stage}")
+
+def show_analysis_job(job, runner):
+    """Show progress for a running job, or its result once finished."""
+    if not job.done:
+        show_progress(job.job_id, runner)
+        return
+
+    try:
+        result = job.result()
+        if result['status'] == 'success':
+            # Keeps only a summary; reruns of a finished job are ignored
+            st.session_state.analysis_history.add(result)
+
+            st.success("Analysis completed!")
+            content = result.get('content') or get_report(result.get('report_path'))
+            if all(section in content for section in REPORT_SECTIONS):
+                render_report(result, content)
+            else:
+                st.markdown(content)
+                if 'report_path' in result:
+                    render_downloads(result)
+        elif result['status'] == 'cancelled':
+            st.warning(f"Analysis stopped: {result.get('message')}")
+            st.markdown(result.get('content') or get_report(result.get('report_path')))
+        else:
+            st.error("Analysis failed!")
+            st.error(f"Error: {result.get('message', 'Unknown error')}")
+            st.write(f"**Error Type:** {result.get('error_type', 'Unknown')}")
+    except Exception as e:
+        st.error(f"Error during analysis: {str(e)}")
+        st.write("Please check your configuration files and API keys.")
+
 def main():
     st.set_page_config(
         page_title="Pitch Deck Analyzer",
@@ -34,14 +244,16 @@ def main():
     st.write("Analyze your pitch deck with our advanced AI-powered tools")
 
     
-    if 'crew' not in st.session_state:
-        try:
-            st.session_state.crew = initialize_crew()
-        except Exception as e:
-            st.error(f"Error initializing crew: {str(e)}")
-            st.stop()
+    if not check_api_keys():
+        st.stop()
+    try:
+        crew = initialize_crew()
+    except Exception as e:
+        st.error(f"Error initializing crew: {str(e)}")
+        st.stop()
+    runner = get_runner()
     if 'analysis_history' not in st.session_state:
-        st.session_state.analysis_history = []
+        st.session_state.analysis_history = AnalysisHistory()
 
     
     st.sidebar.title("Navigation")
@@ -62,158 +274,50 @@ def main():
         website_url = st.text_input("Company Website URL (optional)")
         
         if uploaded_file and company_name and st.button("Start Analysis"):
-            os.makedirs("uploads", exist_ok=True)
-            file_path = os.path.join("uploads", uploaded_file.name)
-            with open(file_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+            file_bytes = uploaded_file.getvalue()
+            key = analysis_key(file_bytes, company_name=company_name, website_url=website_url)
+            # The deck stays pinned while the analysis runs; the collector removes it later
+            owner = f"analysis:{key}"
+            blob = get_blob_store().put(file_bytes, uploaded_file.name, owner=owner)
             
-            with st.spinner("Analyzing pitch deck..."):
-                try:
-                    result = st.session_state.crew.analyze_pitch_deck(
-                        pitch_deck_path=file_path,
-                        company_name=company_name,
-                        website_url=website_url if website_url else ""
-                    )
-                    
-                    
-                    if result['status'] == 'success':
-                        st.session_state.analysis_history.append({
-                            'analysis_id': f"analysis_{len(st.session_state.analysis_history) + 1}",
-                            'timestamp': result['timestamp'],
-                            'company_name': company_name,
-                            'pitch_deck_path': file_path,
-                            'result': result
-                        })
-                        
-                        st.success("Analysis completed!")
-                        
-                        # Create a container for the report
-                        report_container = st.container()
-                        with report_container:
-                            st.markdown("""
-                                <style>
-                                .report-header {
-                                    background-color: #f0f2f6;
-                                    padding: 20px;
-                                    border-radius: 10px;
-                                    margin-bottom: 20px;
-                                }
-                                .section-header {
-                                    color: #1f77b4;
-                                    border-bottom: 2px solid #1f77b4;
-                                    padding-bottom: 5px;
-                                    margin-top: 20px;
-                                }
-                                .highlight-box {
-                                    background-color: #e6f3ff;
-                                    padding: 15px;
-                                    border-radius: 5px;
-                                    margin: 10px 0;
-                                }
-                                .risk-box {
-                                    background-color: #fff3e6;
-                                    padding: 15px;
-                                    border-radius: 5px;
-                                    margin: 10px 0;
-                                }
-                                .recommendation-box {
-                                    background-color: #e6ffe6;
-                                    padding: 15px;
-                                    border-radius: 5px;
-                                    margin: 10px 0;
-                                }
-                                </style>
-                            """, unsafe_allow_html=True)
-                            
-                            # Report Header
-                            st.markdown(f"""
-                                <div class="report-header">
-                                    <h1 style="text-align: center; color: #1f77b4;">INVESTMENT ANALYSIS REPORT</h1>
-                                    <p style="text-align: center;">Generated for: {result.get('company_name', 'N/A')}</p>
-                                    <p style="text-align: center;">Date: {result['timestamp']}</p>
-                                </div>
-                            """, unsafe_allow_html=True)
-                            
-                            # Executive Summary
-                            st.markdown('<h2 class="section-header">EXECUTIVE SUMMARY</h2>', unsafe_allow_html=True)
-                            exec_summary = result['content'].split('## COMPANY ANALYSIS')[0]
-                            st.markdown(exec_summary)
-                            
-                            # Company Analysis
-                            st.markdown('<h2 class="section-header">COMPANY ANALYSIS</h2>', unsafe_allow_html=True)
-                            company_analysis = result['content'].split('## COMPANY ANALYSIS')[1].split('## MARKET ANALYSIS')[0]
-                            st.markdown(company_analysis)
-                            
-                            # Market Analysis
-                            st.markdown('<h2 class="section-header">MARKET ANALYSIS</h2>', unsafe_allow_html=True)
-                            market_analysis = result['content'].split('## MARKET ANALYSIS')[1].split('## COMPETITIVE LANDSCAPE')[0]
-                            st.markdown(market_analysis)
-                            
-                            # Competitive Landscape
-                            st.markdown('<h2 class="section-header">COMPETITIVE LANDSCAPE</h2>', unsafe_allow_html=True)
-                            competitive = result['content'].split('## COMPETITIVE LANDSCAPE')[1].split('## FINANCIAL ANALYSIS')[0]
-                            st.markdown(competitive)
-                            
-                            # Financial Analysis
-                            st.markdown('<h2 class="section-header">FINANCIAL ANALYSIS</h2>', unsafe_allow_html=True)
-                            financial = result['content'].split('## FINANCIAL ANALYSIS')[1].split('## RISK ASSESSMENT')[0]
-                            st.markdown(financial)
-                            
-                            # Risk Assessment
-                            st.markdown('<h2 class="section-header">RISK ASSESSMENT</h2>', unsafe_allow_html=True)
-                            risk = result['content'].split('## RISK ASSESSMENT')[1].split('## DIGITAL PRESENCE AUDIT')[0]
-                            st.markdown(f'<div class="risk-box">{risk}</div>', unsafe_allow_html=True)
-                            
-                            # Digital Presence Audit
-                            st.markdown('<h2 class="section-header">DIGITAL PRESENCE AUDIT</h2>', unsafe_allow_html=True)
-                            digital = result['content'].split('## DIGITAL PRESENCE AUDIT')[1].split('## INVESTMENT RECOMMENDATION')[0]
-                            st.markdown(digital)
-                            
-                            # Investment Recommendation
-                            st.markdown('<h2 class="section-header">INVESTMENT RECOMMENDATION</h2>', unsafe_allow_html=True)
-                            recommendation = result['content'].split('## INVESTMENT RECOMMENDATION')[1].split('## NEXT STEPS')[0]
-                            st.markdown(f'<div class="recommendation-box">{recommendation}</div>', unsafe_allow_html=True)
-                            
-                            # Next Steps
-                            st.markdown('<h2 class="section-header">NEXT STEPS</h2>', unsafe_allow_html=True)
-                            next_steps = result['content'].split('## NEXT STEPS')[1]
-                            st.markdown(next_steps)
-                            
-                            # Download button
-                            st.markdown("---")
-                            if 'report_path' in result:
-                                with open(result['report_path'], 'r', encoding='utf-8') as f:
-                                    report_content = f.read()
-                                st.download_button(
-                                    label="📥 Download Full Report",
-                                    data=report_content,
-                                    file_name=f"{result['company_name']}_analysis_{result['timestamp']}.txt",
-                                    mime="text/plain"
-                                )
-                    else:
-                        st.error("Analysis failed!")
-                        st.error(f"Error: {result.get('message', 'Unknown error')}")
-                        st.write(f"**Error Type:** {result.get('error_type', 'Unknown')}")
-                        
-                except Exception as e:
-                    st.error(f"Error during analysis: {str(e)}")
-                    st.write("Please check your configuration files and API keys.")
+            job = runner.submit(
+                key,
+                crew,
+                on_done=[lambda: get_blob_store().release(owner)],
+                pitch_deck_path=blob.path,
+                company_name=company_name,
+                website_url=website_url if website_url else ""
+            )
+            st.session_state.active_job = job.job_id
+        
+        job = runner.get(st.session_state.get('active_job', ''))
+        if job is not None:
+            show_analysis_job(job, runner)
 
     elif page == "View History":
         st.header("Analysis History")
         
-        if not st.session_state.analysis_history:
+        history = st.session_state.analysis_history
+        if not len(history):
             st.info("No analysis history available")
         else:
-            for analysis in st.session_state.analysis_history:
-                with st.expander(f"Analysis {analysis['analysis_id']} - {analysis['company_name']}"):
-                    st.write(f"**Date:** {analysis['timestamp']}")
-                    st.write(f"**Company:** {analysis['company_name']}")
-                    st.write(f"**Pitch Deck:** {analysis['pitch_deck_path']}")
+            st.caption(f"Showing the {len(history)} most recent analyses (up to {history.limit} are kept)")
+            for analysis in history:
+                with st.expander(f"Analysis {analysis.timestamp} - {analysis.company_name}"):
+                    st.write(f"**Date:** {analysis.timestamp}")
+                    st.write(f"**Company:** {analysis.company_name}")
+                    st.write(f"**Pitch Deck:** {analysis.pitch_deck_path}")
                     
-                    if st.button(f"View Details", key=analysis['analysis_id']):
-                        analysis_content = analysis['result'].get('content', 'No content available')
-                        st.text_area("Analysis Details", str(analysis_content), height=300)
+                    # Report bodies are only read from disk when asked for
+                    if st.button(f"View Details", key=analysis.analysis_id):
+                        st.text_area("Analysis Details", analysis.load_content(), height=300)
+
+        # A session that stops polling is treated as gone and its job cancelled,
+        # so keep polling from here too, without rerunning this page
+        job = runner.get(st.session_state.get('active_job', ''))
+        if job is not None and not job.done:
+            with st.sidebar:
+                show_running_status(job.job_id, runner)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,203 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+from .storage import uploads_dir, atomic_write
+
+
+logger = logging.getLogger('PitchDeckCrew.uploads')
+
+INDEX_NAME = "index.sqlite3"
+DEFAULT_MAX_AGE_HOURS = 24.0
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_GC_INTERVAL_SECONDS = 300
+# Uploads saved before the store existed ("<16 hex>_<name>") and interrupted writes
+STRAY_PATTERN = re.compile(r'^(?:[0-9a-f]{16}_.+|\..+\.tmp)$')
+# A reference nobody releases (e.g. a worker died mid-job) stops pinning its deck after this long
+DEFAULT_LEASE_SECONDS = 6 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    digest TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (digest, owner)
+);
+CREATE INDEX IF NOT EXISTS refs_owner ON refs (owner);
+"""
+
+
+@dataclass(frozen=True)
+class Blob:
+    digest: str
+    path: str
+    size: int
+
+
+class BlobStore:
+    """Content-addressed store for uploaded decks, shared by every process using the uploads directory.
+
+    A deck is stored once as ``<sha256><ext>`` however often it is uploaded.
+    Jobs hold a reference to their deck while they run; unreferenced decks
+    are removed by :meth:`collect` once they exceed the age or size quota.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        max_age_hours: Optional[float] = None,
+        max_bytes: Optional[int] = None
+    ):
+        self.root = Path(root or uploads_dir())
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_age = 3600 * (max_age_hours or float(os.getenv("PITCH_DECK_UPLOADS_MAX_AGE_HOURS", DEFAULT_MAX_AGE_HOURS)))
+        self.max_bytes = max_bytes or int(os.getenv("PITCH_DECK_UPLOADS_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self._gc_thread: Optional[threading.Thread] = None
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.root / INDEX_NAME, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def put(self, data: bytes, filename: str, owner: Optional[str] = None, lease: float = DEFAULT_LEASE_SECONDS) -> Blob:
+        """Store ``data`` unless an identical deck is already stored, optionally referenced by ``owner``.
+
+        The index row is written first, so a concurrent :meth:`collect` either
+        sees the deck as freshly used or has already finished deleting it.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        name = f"{digest}{Path(filename).suffix.lower()}"
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO blobs (digest, name, size, created_at, last_used_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (digest) DO UPDATE SET last_used_at = excluded.last_used_at",
+                (digest, name, len(data), now, now)
+            )
+            if owner:
+                self._add_ref(conn, digest, owner, now + lease)
+            conn.execute("COMMIT")
+            name = conn.execute("SELECT name FROM blobs WHERE digest = ?", (digest,)).fetchone()['name']
+
+        path = self.root / name
+        if path.exists():
+            logger.debug(f"Upload {digest[:12]} already stored")
+        else:
+            atomic_write(path, data)
+            logger.info(f"📥 Stored upload {name} ({len(data)} bytes)")
+        return Blob(digest=digest, path=str(path), size=len(data))
+
+    def acquire(self, digest: str, owner: str, lease: float = DEFAULT_LEASE_SECONDS) -> None:
+        """Pin a stored deck for ``owner`` until released or the lease runs out."""
+        with closing(self._connect()) as conn:
+            self._add_ref(conn, digest, owner, time.time() + lease)
+
+    def release(self, owner: str) -> None:
+        """Drop every reference held by ``owner``."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE blobs SET last_used_at = ? WHERE digest IN (SELECT digest FROM refs WHERE owner = ?)",
+                (now, owner)
+            )
+            conn.execute("DELETE FROM refs WHERE owner = ?", (owner,))
+
+    @staticmethod
+    def _add_ref(conn: sqlite3.Connection, digest: str, owner: str, expires_at: float) -> None:
+        conn.execute(
+            "INSERT INTO refs (digest, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (digest, owner) DO UPDATE SET expires_at = excluded.expires_at",
+            (digest, owner, expires_at)
+        )
+
+    def collect(self) -> Tuple[int, int]:
+        """Delete unreferenced decks past the age quota, then the least recently used beyond the size quota.
+
+        Returns the number of files and bytes freed.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM refs WHERE expires_at < ?", (now,))
+            rows = conn.execute(
+                "SELECT digest, name, size, last_used_at, "
+                "EXISTS (SELECT 1 FROM refs WHERE refs.digest = blobs.digest) AS referenced "
+                "FROM blobs ORDER BY last_used_at"
+            ).fetchall()
+
+            total = sum(row['size'] for row in rows)
+            victims: List[sqlite3.Row] = []
+            for row in rows:
+                if row['referenced']:
+                    continue
+                if row['last_used_at'] < now - self.max_age or total > self.max_bytes:
+                    victims.append(row)
+                    total -= row['size']
+
+            # Files go before their rows commit, so put() never finds a row whose file is being removed
+            for row in victims:
+                (self.root / row['name']).unlink(missing_ok=True)
+            conn.executemany("DELETE FROM blobs WHERE digest = ?", [(row['digest'],) for row in victims])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        freed = sum(row['size'] for row in victims) + self._remove_strays(now)
+        if victims:
+            logger.info(f"🧹 Removed {len(victims)} unused uploads, {total} bytes still stored")
+        return len(victims), freed
+
+    def _remove_strays(self, now: float) -> int:
+        """Remove old legacy uploads and abandoned temporary files the index does not know about."""
+        with closing(self._connect()) as conn:
+            known = {row['name'] for row in conn.execute("SELECT name FROM blobs")}
+        freed = 0
+        for path in self.root.iterdir():
+            if not path.is_file() or path.name in known or not STRAY_PATTERN.match(path.name):
+                continue
+            stat = path.stat()
+            if stat.st_mtime < now - self.max_age:
+                path.unlink(missing_ok=True)
+                freed += stat.st_size
+                logger.info(f"🧹 Removed stray upload {path.name}")
+        return freed
+
+    def start_gc(self, interval: Optional[float] = None) -> None:
+        """Run :meth:`collect` every ``interval`` seconds in a daemon thread."""
+        if self._gc_thread is not None:
+            return
+        interval = interval or float(os.getenv("PITCH_DECK_UPLOADS_GC_INTERVAL", DEFAULT_GC_INTERVAL_SECONDS))
+
+        def loop() -> None:
+            while True:
+                try:
+                    self.collect()
+                except Exception as e:
+                    logger.error(f"❌ Upload garbage collection failed: {e}")
+                time.sleep(interval)
+
+        self._gc_thread = threading.Thread(target=loop, name="uploads-gc", daemon=True)
+        self._gc_thread.start()
@@ -0,0 +1,80 @@
+import time
+import threading
+import contextvars
+from typing import Dict, Optional
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside an analysis once its token is cancelled or its deadline passes.
+
+    ``completed`` holds the outputs of tasks that finished before the stop.
+    """
+
+    def __init__(self, reason: str, completed: Optional[Dict[str, str]] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.completed = completed or {}
+
+
+class CancellationToken:
+    """Cooperative cancellation plus an optional wall-clock deadline for one analysis."""
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+
+    @classmethod
+    def with_timeout(cls, seconds: Optional[float]) -> "CancellationToken":
+        return cls(time.time() + seconds if seconds else None)
+
+    def cancel(self, reason: str = "Analysis cancelled") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline is not None and time.time() >= self.deadline:
+            self.cancel("Analysis deadline exceeded")
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or ``None`` if there is none."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def cap(self, timeout: float) -> float:
+        """Shorten ``timeout`` so it cannot outlive the deadline."""
+        remaining = self.remaining()
+        return timeout if remaining is None else max(1.0, min(timeout, remaining))
+
+    def check(self) -> None:
+        """Raise :class:`AnalysisCancelled` if the analysis should stop."""
+        if self.cancelled:
+            raise AnalysisCancelled(self.reason or "Analysis cancelled")
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to ``seconds``, waking early on cancellation. Returns ``cancelled``."""
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        self._event.wait(seconds)
+        return self.cancelled
+
+
+_current_token: contextvars.ContextVar = contextvars.ContextVar('cancel_token', default=None)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Token of the analysis running in this context, for tools called by agents."""
+    return _current_token.get()
+
+
+def set_current_token(token: Optional[CancellationToken]) -> contextvars.Token:
+    return _current_token.set(token)
+
+
+def reset_current_token(reset: contextvars.Token) -> None:
+    _current_token.reset(reset)
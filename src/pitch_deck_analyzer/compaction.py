@@ -0,0 +1,129 @@
+import re
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import List, Tuple, Optional
+
+
+logger = logging.getLogger('PitchDeckCrew.compaction')
+
+# Rough OpenAI-style estimate; good enough for budgeting prompt size
+CHARS_PER_TOKEN = 4
+
+DEFAULT_CONTEXT_TOKEN_BUDGET = 6000
+DEFAULT_DIGEST_TOKENS = 500
+MIN_DIGEST_TOKENS = 120
+
+SCORE_PATTERN = re.compile(r'(\d+(?:\.\d+)?\s*/\s*(?:5|10|100)\b|\bscore\b|\brating\b)', re.IGNORECASE)
+RED_FLAG_PATTERN = re.compile(
+    r'\b(red flag|risk|concern|weakness|threat|critical|deal-?breaking|unrealistic|lack(?:s|ing)?|missing)\b',
+    re.IGNORECASE
+)
+FACT_PATTERN = re.compile(r'(\d|₹|\$|%|\bcr(?:ore)?\b|\blakh\b|\bTAM\b|\bSAM\b|\bSOM\b|\bCAC\b|\bLTV\b)', re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in ``text``."""
+    return len(text) // CHARS_PER_TOKEN + 1 if text else 0
+
+
+class ContextCompactor:
+    """Turn upstream task outputs into bounded structured digests.
+
+    Digests are built once per distinct output and cached, so a report that
+    feeds several downstream tasks is only compacted once.
+    """
+
+    def __init__(self, digest_tokens: int = DEFAULT_DIGEST_TOKENS, cache_size: int = 64):
+        self.digest_tokens = digest_tokens
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compact(self, outputs: List[Tuple[str, str]], budget: Optional[int], separator: str) -> str:
+        """Join ``(task_id, output)`` pairs, swapping in digests when over ``budget`` tokens.
+
+        The largest outputs are replaced first; if the digests alone are still
+        over budget they are shrunk evenly to fit.
+        """
+        parts = {task_id: text for task_id, text in outputs}
+        order = [task_id for task_id, _ in outputs]
+        budget = budget or DEFAULT_CONTEXT_TOKEN_BUDGET
+
+        def total() -> int:
+            return sum(estimate_tokens(parts[t]) for t in order) + estimate_tokens(separator) * (len(order) - 1)
+
+        if total() <= budget:
+            return separator.join(parts[t] for t in order)
+
+        original = total()
+        for task_id in sorted(order, key=lambda t: len(parts[t]), reverse=True):
+            parts[task_id] = self.digest(task_id, parts[task_id], self.digest_tokens)
+            if total() <= budget:
+                break
+        else:
+            per_output = max(MIN_DIGEST_TOKENS, budget // len(order))
+            for task_id, text in outputs:
+                parts[task_id] = self.digest(task_id, text, per_output)
+
+        logger.info(f"🗜️ Compacted context from ~{original} to ~{total()} tokens (budget {budget})")
+        return separator.join(parts[t] for t in order)
+
+    def digest(self, task_id: str, text: str, max_tokens: Optional[int] = None) -> str:
+        """Return a cached digest of ``text`` no longer than ``max_tokens``."""
+        max_tokens = max_tokens or self.digest_tokens
+        key = (hashlib.sha256(f"{task_id}\0{text}".encode('utf-8')).hexdigest(), max_tokens)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        digest = self._build_digest(task_id, text, max_tokens)
+
+        with self._lock:
+            self._cache[key] = digest
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return digest
+
+    def _build_digest(self, task_id: str, text: str, max_tokens: int) -> str:
+        """Extract key facts, scores and red flags from a task output."""
+        scores, red_flags, facts = [], [], []
+        seen = set()
+
+        for raw_line in text.splitlines():
+            line = raw_line.strip().lstrip('-*•#').strip()
+            if len(line) < 4 or line.lower() in seen:
+                continue
+            seen.add(line.lower())
+            if SCORE_PATTERN.search(line):
+                scores.append(line)
+            elif RED_FLAG_PATTERN.search(line):
+                red_flags.append(line)
+            elif raw_line.lstrip().startswith('#') or FACT_PATTERN.search(line):
+                facts.append(line)
+
+        header = f"[DIGEST of {task_id}]"
+        sections = [("SCORES", scores), ("RED FLAGS", red_flags), ("KEY FACTS", facts)]
+        budget_chars = max_tokens * CHARS_PER_TOKEN - len(header)
+        # Give each section an equal share, letting unused space roll over to the next
+        lines = [header]
+        remaining = budget_chars
+        for index, (title, items) in enumerate(sections):
+            share = remaining // (len(sections) - index)
+            used = 0
+            kept = []
+            for item in items:
+                entry = f"- {item[:300]}"
+                if used + len(entry) + 1 > share - len(title) - 2:
+                    break
+                kept.append(entry)
+                used += len(entry) + 1
+            if kept:
+                lines.append(f"{title}:")
+                lines.extend(kept)
+                used += len(title) + 2
+            remaining -= used
+
+        return "\n".join(lines)
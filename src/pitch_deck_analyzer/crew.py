@@ -4,26 +4,29 @@ import time
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
-from crewai import Crew, Agent, Task, Process, LLM
+from typing import Dict, Any, List, Optional, Union, Callable
+from crewai import Agent, Task, LLM
 from crewai.tools import BaseTool
 from crewai_tools import SerperDevTool, WebsiteSearchTool, ScrapeWebsiteTool
 from dotenv import load_dotenv
 from .tools.file_processor import FileProcessor
 from .tools.website_audit import WebsiteAuditTool
+from .tools.cached_search import CachedSearchTool, LocalSearchTool
+from .llm_pool import LLMPool
+from .scheduler import TaskScheduler, TaskPlan
+from .research_cache import ResearchCache
+from .exports import ReportExporter
+from .storage import reports_dir, atomic_write, new_id
+from .logging_config import configure_logging, correlation, trace_step
+from .cancellation import (
+    AnalysisCancelled, CancellationToken, current_token, set_current_token, reset_current_token
+)
 
 
 load_dotenv()
 
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('pitch_deck_analyzer.log'),
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 logger = logging.getLogger('PitchDeckCrew')
 
 class PitchDeckCrew:
@@ -31,8 +34,6 @@ class PitchDeckCrew:
         """Initialize the PitchDeckCrew with configuration and tools."""
         logger.info("Initializing PitchDeckCrew")
         self.config_dir = Path(__file__).parent / "config"
-        self.start_time = None
-        self.end_time = None
         
         # Load configs with error handling
         try:
@@ -45,13 +46,35 @@ class PitchDeckCrew:
             self.agents_config = self._get_default_agents_config()
             self.tasks_config = self._get_default_tasks_config()
         
-        # Initialize LLM using CrewAI's native LLM class
+        # Initialize the shared LLM client pool and the default client
+        self.llm_pool = LLMPool()
         self.llm = self._initialize_llm()
+        self.research_cache = ResearchCache()
+        self.scheduler = TaskScheduler(self.llm_pool, self._create_agent, research_cache=self.research_cache)
+        self.exporter = ReportExporter()
         
         # Initialize tools
         self.tools = self._initialize_tools()
         logger.info("✅ Tools initialized successfully")
 
+    def warm_up(self) -> None:
+        """Create the agents and LLM clients every configured task uses, so no analysis waits on their setup.
+
+        Agents are kept per thread, so call this on the thread that will run the analyses.
+        """
+        for task_id, config in self.tasks_config.items():
+            agent_config = self.agents_config.get(config.get('agent'))
+            if agent_config is None:
+                continue
+            spec = self.llm_pool.resolve(agent_config, config)
+            budget = config.get('latency_budget')
+            if budget:
+                self.scheduler.agent(config['agent'], self.llm_pool.resolve_fallback(spec, config))
+                # Matches the per-call timeout the scheduler applies to budgeted tasks
+                spec = spec.with_overrides(timeout=min(spec.timeout, float(budget)))
+            self.scheduler.agent(config['agent'], spec)
+        logger.info("🔥 Agents and LLM clients warmed up")
+
     def _initialize_llm(self):
         """Initialize LLM using CrewAI's native LLM class with proper provider syntax"""
         logger.info("Initializing LLM")
@@ -63,15 +86,10 @@ class PitchDeckCrew:
         # Set the API key in environment for OpenAI
         os.environ["OPENAI_API_KEY"] = openai_api_key
         
-        # Use CrewAI's LLM class with OpenAI
+        # Per-agent/per-task clients come from the pool; this is the default one
         try:
             logger.info("Attempting to initialize OpenAI model")
-            llm = LLM(
-                model="gpt-4-turbo-preview",  # or "gpt-3.5-turbo" for a cheaper option
-                temperature=0.1,
-                max_tokens=2000,
-                timeout=120
-            )
+            llm = self.llm_pool.get()
             
             logger.info("✅ LLM initialized successfully with OpenAI")
             return llm
@@ -120,10 +138,14 @@ class PitchDeckCrew:
         logger.info("Initializing tools")
         tools = {}
         
-        if os.getenv("SERPER_API_KEY"):
+        # Search results are cached on disk and shared across decks
+        if os.getenv("LOCAL_SEARCH_FIXTURES"):
+            logger.debug("Initializing local search stand-in")
+            tools["search_tool"] = CachedSearchTool(LocalSearchTool(), self.research_cache)
+        elif os.getenv("SERPER_API_KEY"):
             logger.debug("Initializing search tools")
-            tools["search_tool"] = SerperDevTool()
-            tools["web_search_tool"] = WebsiteSearchTool()
+            tools["search_tool"] = CachedSearchTool(SerperDevTool(), self.research_cache)
+            tools["web_search_tool"] = CachedSearchTool(WebsiteSearchTool(), self.research_cache)
         else:
             logger.warning("SERPER_API_KEY not found, search tools not initialized")
         
@@ -139,91 +161,147 @@ class PitchDeckCrew:
         logger.info(f"Initialized {len(tools)} tools")
         return tools
 
-    def _create_agents(self) -> Dict[str, Agent]:
-        """Create agents based on configuration."""
-        logger.info("Creating agents")
-        agents = {}
+    def _create_agent(self, agent_id: str, llm: LLM) -> Agent:
+        """Create a single agent from configuration, bound to the given LLM."""
+        logger.debug(f"Creating agent: {agent_id}")
+        config = self.agents_config[agent_id]
+        agent_tools = []
         
-        for agent_id, config in self.agents_config.items():
-            logger.debug(f"Creating agent: {agent_id}")
-            agent_tool_names = config.get('tools', [])
-            agent_tools = []
-            
-            for tool_name in agent_tool_names:
-                if tool_name in self.tools:
-                    agent_tools.append(self.tools[tool_name])
-                else:
-                    logger.warning(f"Tool '{tool_name}' not found for agent '{agent_id}'")
-            
-            
-            try:
-                agent = Agent(
-                    role=config['role'],
-                    goal=config['goal'],
-                    backstory=config['backstory'],
-                    verbose=bool(config.get('verbose', True)),
-                    allow_delegation=bool(config.get('allow_delegation', False)),
-                    tools=agent_tools,
-                    llm=self.llm
-                )
-                agents[agent_id] = agent
-                logger.debug(f"Successfully created agent: {agent_id}")
-            except Exception as e:
-                logger.error(f"Error creating agent {agent_id}: {e}")
-                raise
+        for tool_name in config.get('tools', []):
+            if tool_name in self.tools:
+                agent_tools.append(self.tools[tool_name])
+            else:
+                logger.warning(f"Tool '{tool_name}' not found for agent '{agent_id}'")
         
-        logger.info(f"Created {len(agents)} agents")
-        return agents
+        try:
+            agent = Agent(
+                role=config['role'],
+                goal=config['goal'],
+                backstory=config['backstory'],
+                # Verbose agents trace through the sampled, off-thread logger instead of stdout
+                verbose=False,
+                step_callback=self._agent_step_callback(bool(config.get('verbose', True))),
+                allow_delegation=bool(config.get('allow_delegation', False)),
+                tools=agent_tools,
+                llm=llm
+            )
+            logger.debug(f"Successfully created agent: {agent_id}")
+            return agent
+        except Exception as e:
+            logger.error(f"Error creating agent {agent_id}: {e}")
+            raise
+
+    @staticmethod
+    def _agent_step_callback(verbose: bool) -> Callable[[Any], None]:
+        """Trace agent steps if verbose, and stop the agent once its analysis is cancelled."""
+        def on_step(step: Any) -> None:
+            if verbose:
+                trace_step(step)
+            token = current_token()
+            if token:
+                token.check()
+        return on_step
 
-    def _create_tasks(self, agents: Dict[str, Agent], context: Dict[str, Any]) -> List[Task]:
-        """Create tasks based on configuration and context."""
+    def _create_tasks(self, context: Dict[str, Any]) -> List[TaskPlan]:
+        """Create task plans based on configuration and context.
+        
+        Each plan carries the LLM spec resolved from the agent's and the task's
+        ``llm`` settings, plus the task's optional ``latency_budget``,
+        ``context_token_budget`` and ``sector_research`` prompt.
+        """
         logger.info("Creating tasks")
-        tasks = []
-        task_outputs = {}  # To store task outputs for context
+        plans = []
         
         for task_id, config in self.tasks_config.items():
             logger.debug(f"Creating task: {task_id}")
             agent_name = config['agent']
             
-            if agent_name not in agents:
+            if agent_name not in self.agents_config:
                 logger.warning(f"Agent '{agent_name}' not found for task '{task_id}'")
                 continue
             
-            # Build task context from previous task outputs
-            task_context = []
-            if 'context' in config and config['context']:
-                for context_task_id in config['context']:
-                    if context_task_id in task_outputs:
-                        task_context.append(task_outputs[context_task_id])
+            # Only depend on upstream tasks that were actually created
+            planned = {plan.task_id for plan in plans}
+            context_ids = [c for c in (config.get('context') or []) if c in planned]
             
-            # Create the task
             try:
                 task = Task(
                     description=f"{config['description']}\n\nContext: {context}",
-                    expected_output=config['expected_output'],
-                    agent=agents[agent_name],
-                    context=task_context if task_context else None
+                    expected_output=config['expected_output']
                 )
                 
-                tasks.append(task)
-                task_outputs[task_id] = task
-                logger.debug(f"Successfully created task: {task_id}")
+                spec = self.llm_pool.resolve(self.agents_config[agent_name], config)
+                budget = config.get('latency_budget')
+                context_budget = config.get('context_token_budget')
+                plans.append(TaskPlan(
+                    task_id=task_id,
+                    agent_id=agent_name,
+                    task=task,
+                    spec=spec,
+                    context_ids=context_ids,
+                    latency_budget=float(budget) if budget else None,
+                    fallback_spec=self.llm_pool.resolve_fallback(spec, config) if budget else None,
+                    context_token_budget=int(context_budget) if context_budget else None,
+                    sector_research=config.get('sector_research')
+                ))
+                logger.debug(f"Successfully created task: {task_id} ({spec.model})")
             except Exception as e:
                 logger.error(f"Error creating task {task_id}: {e}")
                 raise
         
-        logger.info(f"Created {len(tasks)} tasks")
-        return tasks
+        logger.info(f"Created {len(plans)} tasks")
+        return plans
 
     def analyze_pitch_deck(
         self,
         pitch_deck_path: str,
         company_name: str,
         website_url: Optional[str] = None,
-        analysis_type: str = "comprehensive"
+        analysis_type: str = "comprehensive",
+        progress_callback: Optional[Callable[[str, int, int], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Analyze a pitch deck and generate a comprehensive report.
+        
+        ``progress_callback(stage, completed_tasks, total_tasks)`` is called as
+        the analysis advances. Analyses are independent, so one crew can run
+        several at once from different threads.
+        
+        Cancelling ``cancel_token``, or reaching ``timeout`` seconds (default
+        ``PITCH_DECK_ANALYSIS_TIMEOUT``), stops the remaining tasks, LLM calls
+        and website fetches and returns a ``cancelled`` result with the
+        sections that were completed.
+        """
+        analysis_id = new_id()
+        token = cancel_token or CancellationToken()
+        timeout = timeout or float(os.getenv("PITCH_DECK_ANALYSIS_TIMEOUT") or 0)
+        if timeout:
+            deadline = time.time() + timeout
+            token.deadline = min(token.deadline, deadline) if token.deadline else deadline
+        
+        reset = set_current_token(token)
+        try:
+            with correlation(analysis_id):
+                return self._run_analysis(
+                    pitch_deck_path, company_name, website_url, analysis_type, analysis_id, progress_callback, token
+                )
+        finally:
+            reset_current_token(reset)
+
+    def _run_analysis(
+        self,
+        pitch_deck_path: str,
+        company_name: str,
+        website_url: Optional[str],
+        analysis_type: str,
+        analysis_id: str,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None,
+        token: Optional[CancellationToken] = None
     ) -> Dict[str, Any]:
-        """Analyze a pitch deck and generate a comprehensive report."""
-        self.start_time = time.time()
+        """Run one analysis; every log record it emits carries ``analysis_id``."""
+        progress = progress_callback or (lambda stage, completed, total: None)
+        start_time = time.time()
         timestamp = self._get_timestamp()
         
         try:
@@ -243,8 +321,10 @@ class PitchDeckCrew:
             
             
             logger.info("📄 Processing document...")
+            progress("Processing document", 0, 0)
             file_processor = self.tools["document_processor"]
             processed_content = file_processor._run(pitch_deck_path)
+            token.check()
             
            
             analysis_context = {
@@ -258,48 +338,31 @@ class PitchDeckCrew:
             if website_url:
                 analysis_context['website_url'] = website_url
             
-            logger.info("👥 Creating agents...")
-            
-            agents = self._create_agents()
-            logger.info(f"✅ Created {len(agents)} agents")
-            
             logger.info("📋 Creating tasks...")
-            tasks = self._create_tasks(agents, analysis_context)
-            logger.info(f"✅ Created {len(tasks)} tasks")
+            plans = self._create_tasks(analysis_context)
+            logger.info(f"✅ Created {len(plans)} tasks")
             
-            if not tasks:
+            if not plans:
                 raise ValueError("No tasks were created. Check your configuration.")
             
             
             logger.info("🚀 Starting crew execution...")
-            crew = Crew(
-                agents=list(agents.values()),
-                tasks=tasks,
-                verbose=True,
-                process=Process.sequential
-            )
-            
-           
-            result = crew.kickoff()
+            outputs = self.scheduler.run(plans, progress, token)
             logger.info("✅ Crew execution completed")
             
-            if hasattr(result, 'raw'):
-                content = result.raw
-            elif hasattr(result, 'output'):
-                content = result.output
-            else:
-                content = str(result)
+            # The final task compiles the report
+            content = outputs[plans[-1].task_id]
             
            
-            report_path = self._save_report(content, timestamp, company_name)
+            report_path = self._save_report(content, timestamp, company_name, analysis_id)
             
-            self.end_time = time.time()
-            duration = self._get_analysis_duration()
+            duration = self._get_analysis_duration(start_time, time.time())
             
             logger.info(f"✅ Analysis completed in {duration:.2f} seconds")
             
-            return {
+            result = {
                 "status": "success",
+                "analysis_id": analysis_id,
                 "report_path": str(report_path),
                 "timestamp": timestamp,
                 "content": content,
@@ -309,10 +372,37 @@ class PitchDeckCrew:
                 "file_analyzed": pitch_deck_path,
                 "website_url": website_url
             }
+            # Download formats are rendered in the background, once per report
+            self.exporter.submit(result)
+            return result
+            
+        except AnalysisCancelled as e:
+            duration = self._get_analysis_duration(start_time, time.time())
+            completed = list(e.completed)
+            logger.warning(f"🛑 Analysis stopped after {duration:.2f} seconds: {e.reason}")
+            
+            content = self._compile_partial_report(e.completed, e.reason)
+            report_path = self._save_report(content, timestamp, company_name, analysis_id) if completed else None
+            
+            result = {
+                "status": "cancelled",
+                "message": e.reason,
+                "analysis_id": analysis_id,
+                "report_path": report_path,
+                "timestamp": timestamp,
+                "content": content,
+                "completed_sections": completed,
+                "company_name": company_name,
+                "analysis_type": analysis_type,
+                "duration_seconds": duration,
+                "file_analyzed": pitch_deck_path,
+                "website_url": website_url
+            }
+            self.exporter.submit(result)
+            return result
             
         except Exception as e:
-            self.end_time = time.time()
-            duration = self._get_analysis_duration()
+            duration = self._get_analysis_duration(start_time, time.time())
             
             error_msg = f"Analysis failed: {str(e)}"
             logger.error(f"❌ {error_msg}")
@@ -321,6 +411,7 @@ class PitchDeckCrew:
                 "status": "error",
                 "message": error_msg,
                 "error_type": type(e).__name__,
+                "analysis_id": analysis_id,
                 "timestamp": timestamp,
                 "duration_seconds": duration,
                 "file_analyzed": pitch_deck_path,
@@ -328,6 +419,14 @@ class PitchDeckCrew:
                 "company_name": company_name
             }
 
+    def _compile_partial_report(self, completed: Dict[str, str], reason: str) -> str:
+        """Assemble whatever sections finished before an analysis was stopped."""
+        sections = [f"# PARTIAL INVESTMENT ANALYSIS\n\n_{reason}. Only completed sections are included._"]
+        for task_id, output in completed.items():
+            title = task_id.replace('_task', '').replace('_', ' ').upper()
+            sections.append(f"## {title}\n\n{output}")
+        return "\n\n".join(sections)
+
     def _get_timestamp(self) -> str:
         """Generate a timestamp string."""
         try:
@@ -340,47 +439,43 @@ class PitchDeckCrew:
             logger.debug(f"Using fallback timestamp: {fallback}")
             return fallback
 
-    def _get_analysis_duration(self) -> float:
+    def _get_analysis_duration(self, start_time: Optional[float], end_time: Optional[float]) -> float:
         """Calculate analysis duration."""
-        if self.start_time and self.end_time:
-            duration = self.end_time - self.start_time
+        if start_time and end_time:
+            duration = end_time - start_time
             logger.debug(f"Analysis duration: {duration:.2f} seconds")
             return duration
         logger.warning("Start or end time not set, duration calculation failed")
         return 0.0
 
-    def _save_report(self, result: str, timestamp: str, company_name: str) -> str:
-        """Save the analysis report to a file."""
+    def _save_report(self, result: str, timestamp: str, company_name: str, analysis_id: str) -> str:
+        """Save the analysis report to a file.
+        
+        The analysis id keeps names unique across concurrent workers, and the
+        file is written atomically so readers never see a partial report.
+        """
         logger.info(f"Saving report for {company_name}")
+        report = (
+            f"# Investment Analysis Report\n"
+            f"## Company: {company_name}\n"
+            f"## Generated: {timestamp}\n\n"
+            f"{result}"
+        )
         try:
-            
-            reports_dir = Path("reports")
-            reports_dir.mkdir(exist_ok=True)
-            
-            
             clean_name = "".join(c for c in company_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
             clean_name = clean_name.replace(' ', '_')
             
-           
-            filename = f"{clean_name}_analysis_{timestamp}.txt"
-            file_path = reports_dir / filename
-            
-           
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"# Investment Analysis Report\n")
-                f.write(f"## Company: {company_name}\n")
-                f.write(f"## Generated: {timestamp}\n\n")
-                f.write(str(result))
+            file_path = reports_dir() / f"{clean_name}_analysis_{timestamp}_{analysis_id}.txt"
+            atomic_write(file_path, report)
             
             logger.info(f"📄 Report saved to: {file_path}")
             return str(file_path)
             
         except Exception as e:
             logger.error(f"❌ Error saving report: {e}")
-            fallback_path = f"analysis_{timestamp}.txt"
+            fallback_path = f"analysis_{timestamp}_{analysis_id}.txt"
             try:
-                with open(fallback_path, 'w', encoding='utf-8') as f:
-                    f.write(str(result))
+                atomic_write(fallback_path, str(result))
                 logger.info(f"Saved report to fallback location: {fallback_path}")
                 return fallback_path
             except Exception as e2:
@@ -0,0 +1,288 @@
+import os
+import re
+import html
+import json
+import hashlib
+import logging
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from .storage import reports_dir, atomic_write
+
+
+logger = logging.getLogger('PitchDeckCrew.exports')
+
+DEFAULT_EXPORT_WORKERS = 2
+# Result fields included in the JSON export; local file paths stay private
+JSON_EXPORT_FIELDS = (
+    'analysis_id', 'status', 'company_name', 'analysis_type', 'timestamp',
+    'duration_seconds', 'website_url', 'completed_sections', 'message'
+)
+
+
+@dataclass(frozen=True)
+class ExportFile:
+    """One rendered export, stored under the hash of its bytes."""
+    format: str
+    sha256: str
+    path: str
+    media_type: str
+    size: int
+
+    def download_name(self, company_name: str, timestamp: str) -> str:
+        clean_name = "".join(c for c in company_name if c.isalnum() or c in (' ', '-', '_')).strip()
+        return f"{clean_name.replace(' ', '_') or 'report'}_analysis_{timestamp}.{self.format}"
+
+
+def exports_dir() -> Path:
+    """Content-addressed export files, shared by every report."""
+    return reports_dir() / "exports"
+
+
+def manifest_path(report_path: str) -> Path:
+    """Manifest listing a report's exports, stored next to the report."""
+    return Path(report_path).with_suffix('.exports.json')
+
+
+def _inline_html(text: str) -> str:
+    text = html.escape(text)
+    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    return re.sub(r'(?<![\w*])[*_](?!\s)(.+?)(?<!\s)[*_](?![\w*])', r'<em>\1</em>', text)
+
+
+def markdown_to_html(markdown: str) -> str:
+    """Convert the subset of Markdown the agents write (headings, lists, emphasis) to HTML."""
+    body: List[str] = []
+    paragraph: List[str] = []
+    list_tag: Optional[str] = None
+
+    def flush() -> None:
+        nonlocal list_tag
+        if paragraph:
+            body.append(f"<p>{'<br>'.join(_inline_html(line) for line in paragraph)}</p>")
+            paragraph.clear()
+        if list_tag:
+            body.append(f"</{list_tag}>")
+            list_tag = None
+
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        heading = re.match(r'^(#{1,6})\s+(.*)$', stripped)
+        item = re.match(r'^(?:([-*+])|\d+[.)])\s+(.*)$', stripped)
+        if not stripped:
+            flush()
+        elif heading:
+            flush()
+            level = len(heading.group(1))
+            body.append(f"<h{level}>{_inline_html(heading.group(2))}</h{level}>")
+        elif re.match(r'^(-{3,}|\*{3,}|_{3,})$', stripped):
+            flush()
+            body.append("<hr>")
+        elif item:
+            tag = 'ul' if item.group(1) else 'ol'
+            if paragraph or list_tag != tag:
+                flush()
+                body.append(f"<{tag}>")
+                list_tag = tag
+            body.append(f"<li>{_inline_html(item.group(2))}</li>")
+        else:
+            if list_tag:
+                flush()
+            paragraph.append(stripped)
+    flush()
+    return "\n".join(body)
+
+
+def render_markdown(report: str, result: Dict[str, Any]) -> bytes:
+    return report.encode('utf-8')
+
+
+def render_html(report: str, result: Dict[str, Any]) -> bytes:
+    title = html.escape(f"Investment Analysis Report - {result.get('company_name', '')}")
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{title}</title>\n"
+        "<style>body{font-family:sans-serif;max-width:860px;margin:2em auto;line-height:1.5;color:#222}"
+        "h1,h2{color:#1f77b4;border-bottom:1px solid #ddd;padding-bottom:.2em}"
+        "code{background:#f0f2f6;padding:0 .2em}</style>\n"
+        f"</head>\n<body>\n{markdown_to_html(report)}\n</body>\n</html>\n"
+    ).encode('utf-8')
+
+
+def render_json(report: str, result: Dict[str, Any]) -> bytes:
+    document = {name: result[name] for name in JSON_EXPORT_FIELDS if result.get(name) is not None}
+    document['report'] = report
+    return json.dumps(document, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT = 595, 842  # A4 in points
+PDF_MARGIN = 50
+PDF_FONT_SIZE, PDF_HEADING_SIZE, PDF_LEADING = 10, 13, 14
+PDF_WRAP_CHARS = 95
+
+
+def _pdf_text(text: str) -> str:
+    # The built-in Helvetica fonts cover Latin-1 only
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _pdf_lines(report: str) -> List[Tuple[str, str]]:
+    """Wrap the report into (font, text) lines, with headings in bold."""
+    lines: List[Tuple[str, str]] = []
+    for raw in report.splitlines():
+        heading = re.match(r'^#{1,6}\s+(.*)$', raw.strip())
+        text = re.sub(r'\*\*(.+?)\*\*', r'\1', heading.group(1) if heading else raw.rstrip())
+        if heading:
+            lines.extend([('F1', ''), ('F2', text)])
+            continue
+        indent = len(text) - len(text.lstrip())
+        wrapped = textwrap.wrap(text, PDF_WRAP_CHARS, subsequent_indent=' ' * (indent + 2)) or ['']
+        lines.extend(('F1', line) for line in wrapped)
+    return lines
+
+
+def render_pdf(report: str, result: Dict[str, Any]) -> bytes:
+    """Lay the report out as a plain-text PDF using the standard Helvetica fonts."""
+    per_page = (PDF_PAGE_HEIGHT - 2 * PDF_MARGIN) // PDF_LEADING
+    lines = _pdf_lines(report)
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3-4 fonts, then a page and its content stream per page
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+                            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for page in pages:
+        ops = [f"BT {PDF_MARGIN} {PDF_PAGE_HEIGHT - PDF_MARGIN} Td {PDF_LEADING} TL"]
+        for font, text in page:
+            size = PDF_HEADING_SIZE if font == 'F2' else PDF_FONT_SIZE
+            ops.append(f"/{font} {size} Tf T* ({_pdf_text(text)}) Tj")
+        ops.append("ET")
+        stream = "\n".join(ops).encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>" % (PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT, content_id)
+        )
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % i for i in page_ids), len(page_ids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+EXPORT_FORMATS: Dict[str, Tuple[str, Callable[[str, Dict[str, Any]], bytes]]] = {
+    'md': ('text/markdown', render_markdown),
+    'html': ('text/html', render_html),
+    'pdf': ('application/pdf', render_pdf),
+    'json': ('application/json', render_json),
+}
+
+
+@lru_cache(maxsize=256)
+def _read_manifest(path: str) -> Dict[str, ExportFile]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return {fmt: ExportFile(**entry) for fmt, entry in json.load(f).items()}
+
+
+def load_manifest(report_path: str) -> Optional[Dict[str, ExportFile]]:
+    """Exports already rendered for a report, or ``None`` if there are none yet."""
+    try:
+        return dict(_read_manifest(str(manifest_path(report_path))))
+    except FileNotFoundError:
+        return None
+
+
+def read_export(export: ExportFile) -> bytes:
+    """Bytes of an export, read from disk when a download is offered."""
+    with open(export.path, 'rb') as f:
+        return f.read()
+
+
+class ReportExporter:
+    """Renders every export format of a finished report off the request path.
+
+    Each export is written once under the hash of its content, so identical
+    renders share a file, and a manifest next to the report maps formats to
+    those files. Downloads then just stream the stored files.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        max_workers = max_workers or int(os.getenv("PITCH_DECK_EXPORT_WORKERS", DEFAULT_EXPORT_WORKERS))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, result: Dict[str, Any]) -> Optional[Future]:
+        """Render the exports of ``result`` in the background."""
+        report_path = result.get('report_path')
+        if not report_path:
+            return None
+        with self._lock:
+            future = self._pending.get(report_path)
+            created = future is None
+            if created:
+                future = self._executor.submit(self.export, dict(result))
+                self._pending[report_path] = future
+        if created:
+            # Outside the lock: a future that has already finished runs the callback right here
+            future.add_done_callback(lambda _: self._forget(report_path))
+        return future
+
+    def ensure(self, result: Dict[str, Any]) -> Dict[str, ExportFile]:
+        """Exports of ``result``, waiting for or running the render if it has not finished."""
+        report_path = result.get('report_path')
+        if not report_path:
+            return {}
+        exports = load_manifest(report_path)
+        if exports is not None:
+            return exports
+        with self._lock:
+            future = self._pending.get(report_path)
+        return future.result() if future is not None else self.export(result)
+
+    def export(self, result: Dict[str, Any]) -> Dict[str, ExportFile]:
+        """Render all formats of a saved report and record them in its manifest."""
+        report_path = result['report_path']
+        try:
+            with open(report_path, 'r', encoding='utf-8') as f:
+                report = f.read()
+
+            exports = {}
+            for fmt, (media_type, render) in EXPORT_FORMATS.items():
+                data = render(report, result)
+                digest = hashlib.sha256(data).hexdigest()
+                path = exports_dir() / f"{digest}.{fmt}"
+                if not path.exists():
+                    atomic_write(path, data)
+                exports[fmt] = ExportFile(fmt, digest, str(path), media_type, len(data))
+
+            atomic_write(manifest_path(report_path), json.dumps(
+                {fmt: asdict(export) for fmt, export in exports.items()}, indent=2
+            ))
+            logger.info(f"📦 Exported {report_path} as {', '.join(exports)}")
+            return exports
+        except Exception as e:
+            logger.error(f"❌ Error exporting {report_path}: {e}")
+            raise
+
+    def _forget(self, report_path: str) -> None:
+        with self._lock:
+            self._pending.pop(report_path, None)
@@ -0,0 +1,70 @@
+import os
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+
+DEFAULT_HISTORY_LIMIT = 50
+
+
+def load_report(report_path: Optional[str]) -> str:
+    """Read a stored report, or a placeholder if there is none."""
+    if not report_path or not Path(report_path).exists():
+        return "No content available"
+    with open(report_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    """Lightweight summary of a finished analysis; the report body stays on disk."""
+    analysis_id: str
+    timestamp: str
+    company_name: str
+    pitch_deck_path: str
+    report_path: Optional[str]
+    status: str
+    duration_seconds: float = 0.0
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "HistoryEntry":
+        return cls(
+            analysis_id=result.get('analysis_id', ''),
+            timestamp=result.get('timestamp', ''),
+            company_name=result.get('company_name', ''),
+            pitch_deck_path=result.get('file_analyzed', ''),
+            report_path=result.get('report_path'),
+            status=result.get('status', 'unknown'),
+            duration_seconds=result.get('duration_seconds', 0.0)
+        )
+
+    def load_content(self) -> str:
+        """Read the report body from the report store."""
+        return load_report(self.report_path)
+
+
+class AnalysisHistory:
+    """Most-recent-first analysis history capped at ``limit`` summaries.
+
+    Only summaries are kept in memory; report bodies are loaded from disk on
+    demand, so long-lived sessions stay small.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit or int(os.getenv("PITCH_DECK_HISTORY_LIMIT", DEFAULT_HISTORY_LIMIT))
+        self._entries: "deque[HistoryEntry]" = deque(maxlen=self.limit)
+
+    def add(self, result: Dict[str, Any]) -> Optional[HistoryEntry]:
+        """Record a result unless it is already in the history."""
+        entry = HistoryEntry.from_result(result)
+        if any(existing.analysis_id == entry.analysis_id for existing in self._entries):
+            return None
+        self._entries.appendleft(entry)
+        return entry
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
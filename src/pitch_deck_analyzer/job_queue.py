@@ -0,0 +1,192 @@
+import json
+import time
+import socket
+import sqlite3
+import logging
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+from .storage import queue_path, worker_socket_path, new_id
+
+
+logger = logging.getLogger('PitchDeckCrew.queue')
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Workers heartbeat their running jobs this often; a running job silent for
+# DEFAULT_STALE_AFTER_SECONDS is assumed to belong to a dead worker and is claimed again
+HEARTBEAT_SECONDS = 60
+DEFAULT_STALE_AFTER_SECONDS = 10 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    status: str
+    payload: Dict[str, Any]
+    result: Optional[Dict[str, Any]]
+    worker: Optional[str]
+    attempts: int
+    cancel_requested: bool
+    created_at: float
+    updated_at: float
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+
+class JobQueue:
+    """Durable FIFO job queue in a local SQLite file, shared by API and worker processes."""
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        stale_after: float = DEFAULT_STALE_AFTER_SECONDS,
+        wakeup_path: Optional[Union[str, Path]] = None
+    ):
+        self.path = Path(path or queue_path())
+        self.wakeup_path = Path(wakeup_path or worker_socket_path())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stale_after = stale_after
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if 'cancel_requested' not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        """Add a job and return its id."""
+        job_id = job_id or new_id()
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(payload), now, now)
+            )
+        logger.info(f"📥 Queued job {job_id}")
+        self._wake_worker(job_id)
+        return job_id
+
+    def _wake_worker(self, job_id: str) -> None:
+        """Tell an idle pooled worker to claim now instead of at its next poll."""
+        if not hasattr(socket, 'AF_UNIX'):
+            return
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+                sock.setblocking(False)
+                sock.sendto(job_id.encode('utf-8'), str(self.wakeup_path))
+        except OSError:
+            # No pool is listening or its backlog is full; workers still poll the queue
+            pass
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Atomically take the oldest queued (or abandoned) job for ``worker``."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Jobs cancelled before any worker picked them up never run
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ? AND cancel_requested = 1",
+                (CANCELLED, now, QUEUED)
+            )
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? OR (status = ? AND updated_at < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now - self.stale_after)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (RUNNING, worker, now, row['id'])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return self.get(row['id'])
+
+    def heartbeat(self, job_id: str, worker: str) -> None:
+        """Mark ``worker``'s running job as alive so no other worker reclaims it."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND status = ? AND worker = ?",
+                (time.time(), job_id, RUNNING, worker)
+            )
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Store a finished job's result; error results mark the job as failed."""
+        status = {"success": DONE, "cancelled": CANCELLED}.get(result.get("status"), FAILED)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, updated_at = ? WHERE id = ?",
+                (status, json.dumps(result, default=str), time.time(), job_id)
+            )
+
+    def cancel(self, job_id: str) -> None:
+        """Ask for a job to stop; the worker running it notices within a second or so."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                (time.time(), job_id, QUEUED, RUNNING)
+            )
+        logger.info(f"🛑 Cancellation requested for job {job_id}")
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return Job(
+            id=row['id'],
+            status=row['status'],
+            payload=json.loads(row['payload']),
+            result=json.loads(row['result']) if row['result'] else None,
+            worker=row['worker'],
+            attempts=row['attempts'],
+            cancel_requested=bool(row['cancel_requested']),
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        )
+
+    def depth(self) -> int:
+        """Number of jobs waiting to be claimed."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
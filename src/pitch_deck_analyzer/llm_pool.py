@@ -0,0 +1,107 @@
+import threading
+import time
+import logging
+from dataclasses import dataclass, fields
+from typing import Dict, Any, Optional
+from crewai import LLM
+
+
+logger = logging.getLogger('PitchDeckCrew.llm')
+
+# Used for any agent/task that does not override a setting in its YAML ``llm`` block
+DEFAULT_MODEL = "gpt-4-turbo-preview"
+DEFAULT_FALLBACK_MODEL = "gpt-3.5-turbo"
+
+# How long a task stays on its fallback model after blowing its latency budget
+FALLBACK_COOLDOWN_SECONDS = 15 * 60
+
+
+@dataclass(frozen=True)
+class LLMSpec:
+    """Hashable description of an LLM client; identical specs share one client."""
+    model: str = DEFAULT_MODEL
+    temperature: float = 0.1
+    max_tokens: int = 2000
+    timeout: float = 120
+
+    @classmethod
+    def from_settings(cls, *layers: Optional[Dict[str, Any]]) -> "LLMSpec":
+        """Merge settings dicts left to right, later layers winning."""
+        allowed = {f.name for f in fields(cls)}
+        merged: Dict[str, Any] = {}
+        for layer in layers:
+            for key, value in (layer or {}).items():
+                if key in allowed and value is not None:
+                    merged[key] = value
+        return cls(**merged)
+
+    def with_overrides(self, **overrides: Any) -> "LLMSpec":
+        """Return a copy of this spec with the given settings replaced."""
+        values = {f.name: getattr(self, f.name) for f in fields(self)}
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return LLMSpec(**values)
+
+
+class LLMPool:
+    """Build each distinct LLM client once and track per-task latency budgets."""
+
+    def __init__(self, defaults: Optional[Dict[str, Any]] = None):
+        self.default_spec = LLMSpec.from_settings(defaults)
+        self._clients: Dict[LLMSpec, LLM] = {}
+        self._breaches: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, spec: Optional[LLMSpec] = None) -> LLM:
+        """Return the shared client for ``spec``, creating it on first use."""
+        spec = spec or self.default_spec
+        with self._lock:
+            client = self._clients.get(spec)
+            if client is None:
+                logger.info(f"Creating LLM client: {spec.model} (max_tokens={spec.max_tokens}, timeout={spec.timeout}s)")
+                client = LLM(
+                    model=spec.model,
+                    temperature=spec.temperature,
+                    max_tokens=spec.max_tokens,
+                    timeout=spec.timeout
+                )
+                self._clients[spec] = client
+            return client
+
+    def resolve(self, agent_config: Dict[str, Any], task_config: Optional[Dict[str, Any]] = None) -> LLMSpec:
+        """Resolve the spec for a task: pool defaults < agent ``llm`` < task ``llm``."""
+        task_config = task_config or {}
+        return LLMSpec.from_settings(
+            self._as_dict(self.default_spec),
+            agent_config.get('llm'),
+            task_config.get('llm')
+        )
+
+    def resolve_fallback(self, spec: LLMSpec, task_config: Dict[str, Any]) -> LLMSpec:
+        """Resolve the faster spec a task falls back to when over its latency budget."""
+        return spec.with_overrides(model=task_config.get('fallback_model') or DEFAULT_FALLBACK_MODEL)
+
+    def record_latency(self, task_id: str, seconds: float, budget: Optional[float]) -> None:
+        """Record a task run and remember it if it exceeded its budget."""
+        if budget and seconds > budget:
+            logger.warning(f"⏱️ Task {task_id} took {seconds:.1f}s, over its {budget:.0f}s budget")
+            self.mark_breach(task_id)
+
+    def mark_breach(self, task_id: str) -> None:
+        """Route ``task_id`` to its fallback model for the cooldown period."""
+        with self._lock:
+            self._breaches[task_id] = time.monotonic()
+
+    def should_fallback(self, task_id: str) -> bool:
+        """Whether ``task_id`` recently exceeded its budget and should start on the fallback."""
+        with self._lock:
+            breached_at = self._breaches.get(task_id)
+            if breached_at is None:
+                return False
+            if time.monotonic() - breached_at > FALLBACK_COOLDOWN_SECONDS:
+                del self._breaches[task_id]
+                return False
+            return True
+
+    @staticmethod
+    def _as_dict(spec: LLMSpec) -> Dict[str, Any]:
+        return {f.name: getattr(spec, f.name) for f in fields(spec)}
@@ -0,0 +1,178 @@
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Iterator, Optional
+
+
+DEFAULT_LOG_FILE = "pitch_deck_analyzer.log"
+DEFAULT_LOG_LEVEL = "INFO"
+# Third-party subsystems that are noisy at DEBUG/INFO
+DEFAULT_SUBSYSTEM_LEVELS = "httpx=WARNING,httpcore=WARNING,LiteLLM=WARNING,urllib3=WARNING"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_TRACE_RATE = 5.0
+
+TRACE_LOGGER = 'PitchDeckCrew.trace'
+
+_analysis_id: contextvars.ContextVar = contextvars.ContextVar('analysis_id', default=None)
+_listener: Optional[QueueListener] = None
+_configured_pid: Optional[int] = None
+_configured_name: Optional[str] = None
+_lock = threading.Lock()
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamp each record with the analysis id of the code that logged it."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.analysis_id = _analysis_id.get()
+        return True
+
+
+class TraceSampler(logging.Filter):
+    """Token-bucket rate limit for verbose agent traces, reporting what was dropped."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst or max(rate * 2, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                self.dropped += 1
+                return False
+            self.tokens -= 1
+            if self.dropped:
+                record.msg = f"{record.msg} [{self.dropped} earlier trace records sampled out]"
+                self.dropped = 0
+            return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "analysis_id": getattr(record, 'analysis_id', None),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def configure_logging(process_name: Optional[str] = None) -> None:
+    """Route all logging through a queue drained by a background thread.
+
+    Safe to call repeatedly. Passing ``process_name`` gives the calling
+    process its own log file, so rotation never races between processes;
+    forked children are switched to their own file automatically.
+    """
+    global _listener, _configured_pid, _configured_name
+    with _lock:
+        if _configured_pid == os.getpid() and process_name in (None, _configured_name):
+            return
+        if _listener is not None and _configured_pid == os.getpid():
+            _listener.stop()
+
+        log_file = os.getenv("PITCH_DECK_LOG_FILE", DEFAULT_LOG_FILE)
+        if process_name:
+            root, ext = os.path.splitext(log_file)
+            log_file = f"{root}.{process_name}{ext or '.log'}"
+
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=int(os.getenv("PITCH_DECK_LOG_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            backupCount=int(os.getenv("PITCH_DECK_LOG_BACKUPS", DEFAULT_BACKUP_COUNT)),
+            encoding='utf-8',
+            # A forked child that renames itself before logging leaves no empty per-PID file behind
+            delay=True
+        )
+        file_handler.setFormatter(JsonFormatter())
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(os.getenv("PITCH_DECK_CONSOLE_LOG_LEVEL", DEFAULT_LOG_LEVEL).upper())
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.addFilter(CorrelationFilter())
+
+        root_logger = logging.getLogger()
+        for handler in list(root_logger.handlers):
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(queue_handler)
+        root_logger.setLevel(os.getenv("PITCH_DECK_LOG_LEVEL", DEFAULT_LOG_LEVEL).upper())
+        trace_logger = logging.getLogger(TRACE_LOGGER)
+        trace_logger.setLevel(logging.DEBUG)
+        for existing in list(trace_logger.filters):
+            trace_logger.removeFilter(existing)
+        trace_logger.addFilter(TraceSampler(float(os.getenv("PITCH_DECK_TRACE_RATE", DEFAULT_TRACE_RATE))))
+        _apply_subsystem_levels(os.getenv("PITCH_DECK_LOG_LEVELS", DEFAULT_SUBSYSTEM_LEVELS))
+
+        _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+        _configured_pid = os.getpid()
+        _configured_name = process_name
+
+
+def _apply_subsystem_levels(spec: str) -> None:
+    """Apply ``name=LEVEL,name=LEVEL`` overrides to individual loggers."""
+    for item in spec.split(','):
+        if '=' in item:
+            name, level = item.split('=', 1)
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+
+def _stop_listener() -> None:
+    if _listener is not None and _configured_pid == os.getpid():
+        _listener.stop()
+
+
+def _reconfigure_after_fork() -> None:
+    """The listener thread does not survive fork; give the child its own."""
+    global _lock
+    _lock = threading.Lock()
+    if _configured_pid is not None:
+        configure_logging(process_name=str(os.getpid()))
+
+
+atexit.register(_stop_listener)
+os.register_at_fork(after_in_child=_reconfigure_after_fork)
+
+
+@contextmanager
+def correlation(analysis_id: str) -> Iterator[None]:
+    """Tag every log record emitted inside the block with ``analysis_id``."""
+    token = _analysis_id.set(analysis_id)
+    try:
+        yield
+    finally:
+        _analysis_id.reset(token)
+
+
+def trace_step(step: Any) -> None:
+    """Agent ``step_callback`` that logs agent steps through the sampled trace logger."""
+    logger = logging.getLogger(TRACE_LOGGER)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(str(step)[:2000])
@@ -0,0 +1,144 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from .storage import cache_dir, atomic_write
+
+
+logger = logging.getLogger('PitchDeckCrew.research')
+
+DEFAULT_RESEARCH_TTL_HOURS = 7 * 24
+
+# A sector needs at least this many keyword hits, and this many times the runner-up's, to be chosen
+MIN_SECTOR_HITS = 3
+SECTOR_MARGIN = 1.5
+
+# Sector -> sub-sector -> keywords, matched as whole words (plurals included). Detection runs on
+# investment analyses, so words every analysis uses ("investment", "policy", "brand", "credit",
+# "subscription", "api") are deliberately left out.
+SECTOR_KEYWORDS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "fintech": {
+        "payments": ("payment", "upi", "wallet", "merchant", "pos", "remittance"),
+        "lending": ("lending", "loan", "nbfc", "bnpl", "underwriting", "credit score"),
+        "insurtech": ("insurance", "insurtech", "policyholder", "claim settlement"),
+        "wealthtech": ("wealth management", "wealthtech", "mutual fund", "brokerage", "demat", "robo-advisor"),
+    },
+    "healthtech": {
+        "telemedicine": ("telemedicine", "teleconsult", "doctor", "patient"),
+        "diagnostics": ("diagnostic", "lab test", "pathology", "imaging"),
+        "pharmacy": ("pharmacy", "medicine delivery", "e-pharmacy"),
+    },
+    "edtech": {
+        "k12": ("k-12", "k12", "school", "tuition", "cbse"),
+        "upskilling": ("upskilling", "reskilling", "bootcamp", "online course"),
+        "test-prep": ("test prep", "jee", "neet", "exam preparation"),
+    },
+    "ecommerce": {
+        "d2c": ("d2c", "dtc", "direct-to-consumer"),
+        "marketplace": ("marketplace", "sellers", "gmv"),
+        "quick-commerce": ("quick commerce", "q-commerce", "10-minute", "dark store"),
+    },
+    "saas": {
+        "b2b-saas": ("saas", "arr", "mrr", "enterprise software", "b2b software"),
+    },
+    "agritech": {
+        "farm-inputs": ("farmer", "agritech", "agriculture", "crop", "fpo", "mandi"),
+    },
+    "logistics": {
+        "last-mile": ("logistics", "last-mile", "delivery fleet", "freight", "shipment"),
+    },
+    "cleantech": {
+        "ev": ("electric vehicle", "ev", "charging", "battery"),
+        "renewables": ("solar", "renewable", "carbon capture", "carbon credit"),
+    },
+}
+
+
+_SECTOR_PATTERNS = {
+    f"{sector}/{sub_sector}": re.compile(
+        r'\b(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + r')(?:s|es)?\b'
+    )
+    for sector, sub_sectors in SECTOR_KEYWORDS.items()
+    for sub_sector, keywords in sub_sectors.items()
+}
+
+
+def detect_sector(text: str) -> Optional[str]:
+    """Return a normalized ``sector/sub-sector`` key for a deck analysis, if clearly recognizable.
+
+    Returns ``None`` when no sub-sector has enough hits or two are too close
+    to call, so unrelated decks never share research.
+    """
+    lowered = text.lower()
+    hits = sorted(
+        ((len(pattern.findall(lowered)), key) for key, pattern in _SECTOR_PATTERNS.items()),
+        reverse=True
+    )
+    (best_hits, best), (runner_up_hits, _) = hits[0], hits[1]
+    if best_hits < MIN_SECTOR_HITS or best_hits < SECTOR_MARGIN * runner_up_hits:
+        return None
+    return best
+
+
+class ResearchCache:
+    """On-disk cache of sector research and search-tool results with a freshness TTL.
+
+    Entries are plain JSON files written atomically, so several processes can
+    share one cache directory.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None, ttl_hours: Optional[float] = None):
+        self.root = Path(root_dir or cache_dir()) / "research"
+        self.ttl_seconds = float(ttl_hours or os.getenv("RESEARCH_CACHE_TTL_HOURS") or DEFAULT_RESEARCH_TTL_HOURS) * 3600
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def get_research(self, sector: str, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return ``{'content', 'created_at'}`` for fresh cached research, else ``None``."""
+        return self._read(self._path("sector-research", f"{sector}:{task_id}"))
+
+    def put_research(self, sector: str, task_id: str, content: str) -> None:
+        self._write(self._path("sector-research", f"{sector}:{task_id}"), {
+            "sector": sector,
+            "task_id": task_id,
+            "content": content,
+            "created_at": time.time()
+        })
+        logger.info(f"💾 Cached {task_id} research for sector {sector}")
+
+    def get_search(self, tool_name: str, query: Dict[str, Any]) -> Optional[str]:
+        entry = self._read(self._path("search", self._query_key(tool_name, query)))
+        return entry["content"] if entry else None
+
+    def put_search(self, tool_name: str, query: Dict[str, Any], content: str) -> None:
+        self._write(self._path("search", self._query_key(tool_name, query)), {
+            "tool": tool_name,
+            "query": query,
+            "content": content,
+            "created_at": time.time()
+        })
+
+    @staticmethod
+    def _query_key(tool_name: str, query: Dict[str, Any]) -> str:
+        normalized = {k: " ".join(str(v).lower().split()) for k, v in query.items()}
+        return f"{tool_name}:{json.dumps(normalized, sort_keys=True)}"
+
+    def _path(self, kind: str, key: str) -> Path:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return self.root / kind / f"{digest}.json"
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            return None
+        return entry
+
+    def _write(self, path: Path, entry: Dict[str, Any]) -> None:
+        atomic_write(path, json.dumps(entry))
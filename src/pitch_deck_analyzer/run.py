@@ -1,8 +1,44 @@
 from dotenv import load_dotenv
 import streamlit as st
-from pitch_deck_analyzer import PitchDeckCrew, FileProcessor
+from pitch_deck_analyzer import PitchDeckCrew
+from pitch_deck_analyzer.runner import AnalysisRunner, analysis_key
+from pitch_deck_analyzer.blob_store import BlobStore
+from pitch_deck_analyzer.exports import read_export
+from pitch_deck_analyzer.history import load_report
 import os
-from pathlib import Path
+import time
+
+PROGRESS_POLL_SECONDS = 1.0
+
+@st.cache_resource
+def get_crew():
+    """Crew shared by every session on this Streamlit server."""
+    return PitchDeckCrew()
+
+@st.cache_resource
+def get_runner():
+    """Background analysis runner shared by every session."""
+    return AnalysisRunner()
+
+@st.cache_resource
+def get_blob_store():
+    """Deduplicated upload store, garbage-collected in the background."""
+    store = BlobStore()
+    store.start_gc()
+    return store
+
+# Reports and exports never change once written, so a few of each are kept per server
+CACHED_FILES = 16
+
+@st.cache_data(max_entries=CACHED_FILES)
+def get_export_bytes(sha256, _export):
+    """Bytes of an export, read once per content hash."""
+    return read_export(_export)
+
+@st.cache_data(max_entries=CACHED_FILES)
+def get_report(report_path):
+    """Body of a saved report, read once per report."""
+    return load_report(report_path)
 
 def main():
     # Load environment variables
@@ -18,7 +54,7 @@ def main():
     # Check for required API keys
     required_keys = ["GROQ_API_KEY", "SERPER_API_KEY"]
     missing_keys = [key for key in required_keys if not os.getenv(key)]
-    
+
     if missing_keys:
         st.error(f"Missing required API keys: {', '.join(missing_keys)}")
         st.info("Please add the missing API keys to your .env file")
@@ -27,8 +63,9 @@ def main():
     st.title("📊 Pitch Deck Analysis Platform")
     st.write("Upload your pitch deck and get AI-powered analysis and recommendations.")
 
-    # Initialize the crew
-    crew = PitchDeckCrew()
+    # Initialize the crew once per process
+    crew = get_crew()
+    runner = get_runner()
 
     # Company information
     company_name = st.text_input("Company Name", "")
@@ -49,55 +86,74 @@ def main():
     )
 
     if uploaded_file and company_name:
-        try:
-            # Save the uploaded file temporarily
-            temp_dir = Path("temp")
-            temp_dir.mkdir(exist_ok=True)
-            
-            file_path = temp_dir / uploaded_file.name
-            with open(file_path, "wb") as f:
-                f.write(uploaded_file.getvalue())
-            
-            # Analyze the pitch deck
-            with st.spinner("Analyzing pitch deck..."):
-                result = crew.analyze_pitch_deck(
-                    pitch_deck_path=str(file_path),
-                    company_name=company_name,
-                    website_url=website_url if website_url else None,
-                    analysis_type=analysis_type
-                )
-                
-                if result["status"] == "success":
-                    st.success("Analysis completed successfully!")
-                    
-                    # Display the report
-                    st.subheader(f"Analysis Report for {result['company_name']}")
-                    st.text(result["content"])
-                    
-                    # Provide download link
-                    with open(result["report_path"], "r", encoding="utf-8") as f:
-                        report_content = f.read()
-                    st.download_button(
-                        label="Download Report",
-                        data=report_content,
-                        file_name=f"{result['company_name']}_analysis_{result['timestamp']}.txt",
-                        mime="text/plain"
-                    )
-                else:
-                    st.error(f"Analysis failed: {result['message']}")
-                    
-        except Exception as e:
-            st.error(f"Error during analysis: {str(e)}")
-            st.info("Please check your configuration files and API keys.")
-            
-        finally:
-            # Clean up temporary file
-            if file_path.exists():
-                file_path.unlink()
+        # Only an explicit click starts an analysis; widget changes just rerun the page
+        if st.button("Analyze Pitch Deck"):
+            file_bytes = uploaded_file.getvalue()
+            key = analysis_key(
+                file_bytes,
+                company_name=company_name,
+                website_url=website_url,
+                analysis_type=analysis_type
+            )
+
+            # Identical decks are stored once; the reference is dropped when the analysis ends
+            owner = f"analysis:{key}"
+            blob = get_blob_store().put(file_bytes, uploaded_file.name, owner=owner)
+
+            job = runner.submit(
+                key,
+                crew,
+                on_done=[lambda: get_blob_store().release(owner)],
+                pitch_deck_path=blob.path,
+                company_name=company_name,
+                website_url=website_url if website_url else None,
+                analysis_type=analysis_type
+            )
+            st.session_state.active_job = job.job_id
     elif uploaded_file and not company_name:
         st.warning("Please enter the company name to proceed with the analysis.")
 
+    job = runner.get(st.session_state.get("active_job", ""))
+    if job is None:
+        return
+
+    if not job.done:
+        st.info(f"Analyzing pitch deck... ({job.stage})")
+        st.progress(job.fraction)
+        if st.button("Cancel Analysis"):
+            runner.cancel(job.job_id)
+        # Polling also tells the runner this session is still waiting for the job
+        time.sleep(PROGRESS_POLL_SECONDS)
+        st.rerun()
+
+    try:
+        result = job.result()
+        if result["status"] == "success":
+            st.success("Analysis completed successfully!")
+
+            # Display the report
+            st.subheader(f"Analysis Report for {result['company_name']}")
+            st.text(result.get("content") or get_report(result.get("report_path")))
+
+            # Exports are rendered once when the analysis finishes
+            exports = crew.exporter.ensure(result)
+            for column, export in zip(st.columns(len(exports) or 1), exports.values()):
+                column.download_button(
+                    label=f"Download {export.format.upper()}",
+                    data=get_export_bytes(export.sha256, export),
+                    file_name=export.download_name(result["company_name"], result["timestamp"]),
+                    mime=export.media_type,
+                    key=f"download_{export.sha256}"
+                )
+        elif result["status"] == "cancelled":
+            st.warning(f"Analysis stopped: {result['message']}")
+            st.text(result.get("content") or get_report(result.get("report_path")))
+        else:
+            st.error(f"Analysis failed: {result['message']}")
+
+    except Exception as e:
+        st.error(f"Error during analysis: {str(e)}")
+        st.info("Please check your configuration files and API keys.")
+
 if __name__ == "__main__":
     main()
-
- 
\ No newline at end of file
@@ -0,0 +1,152 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, Iterable, Optional
+from .storage import new_id
+from .cancellation import CancellationToken
+
+
+logger = logging.getLogger('PitchDeckCrew.runner')
+
+DEFAULT_MAX_WORKERS = 4
+# Finished jobs are kept this long so every session polling them sees the result
+FINISHED_JOB_TTL_SECONDS = 60 * 60
+# A running job nobody has polled for this long was left behind and is cancelled
+ABANDONED_AFTER_SECONDS = 30
+WATCHDOG_INTERVAL_SECONDS = 5
+
+
+def analysis_key(file_bytes: bytes, **analysis_kwargs: Any) -> str:
+    """Identify an analysis by deck content and settings, so duplicates can be merged."""
+    digest = hashlib.sha256(file_bytes)
+    for name in sorted(analysis_kwargs):
+        digest.update(f"\0{name}={analysis_kwargs[name]}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+@dataclass
+class AnalysisJob:
+    """A background analysis and its latest progress."""
+    job_id: str
+    key: str
+    future: Future
+    token: CancellationToken = field(default_factory=CancellationToken)
+    submitted_at: float = field(default_factory=time.time)
+    polled_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    stage: str = "Queued"
+    completed: int = 0
+    total: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    @property
+    def fraction(self) -> float:
+        return self.completed / self.total if self.total else 0.0
+
+    def result(self) -> Dict[str, Any]:
+        return self.future.result()
+
+    def update(self, stage: str, completed: int, total: int) -> None:
+        self.stage, self.completed, self.total = stage, completed, total
+
+
+class AnalysisRunner:
+    """Process-wide pool running analyses off the Streamlit script thread.
+
+    Submitting an analysis that is already running returns the existing job,
+    so reruns and duplicate clicks never start a second copy. Jobs that no
+    session polls any more (the user navigated away) are cancelled.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        max_workers = max_workers or int(os.getenv("PITCH_DECK_UI_WORKERS", DEFAULT_MAX_WORKERS))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._running: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._watchdog = threading.Thread(target=self._cancel_abandoned, name="analysis-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def submit(
+        self,
+        key: str,
+        crew: Any,
+        on_done: Iterable[Callable[[], None]] = (),
+        **analysis_kwargs: Any
+    ) -> AnalysisJob:
+        """Start ``crew.analyze_pitch_deck(**analysis_kwargs)`` unless the same analysis is running.
+
+        ``on_done`` callbacks run once the analysis finishes, whatever its outcome.
+        """
+        with self._lock:
+            self._prune()
+            running_id = self._running.get(key)
+            if running_id is not None:
+                logger.info(f"Analysis {key[:12]} already running as job {running_id}")
+                return self._jobs[running_id]
+
+            job_id = new_id()
+            future: Future = Future()
+            job = AnalysisJob(job_id=job_id, key=key, future=future)
+            self._jobs[job_id] = job
+            self._running[key] = job_id
+
+        self._executor.submit(self._run, job, crew, list(on_done), analysis_kwargs)
+        logger.info(f"Submitted analysis job {job_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """Look up a job; each lookup counts as a session still watching it."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.polled_at = time.time()
+            return job
+
+    def cancel(self, job_id: str, reason: str = "Analysis cancelled by the user") -> None:
+        job = self.get(job_id)
+        if job is not None and not job.done:
+            job.token.cancel(reason)
+
+    def _cancel_abandoned(self) -> None:
+        while True:
+            time.sleep(WATCHDOG_INTERVAL_SECONDS)
+            cutoff = time.time() - ABANDONED_AFTER_SECONDS
+            with self._lock:
+                abandoned = [job for job in self._jobs.values() if not job.done and job.polled_at < cutoff]
+            for job in abandoned:
+                logger.info(f"Cancelling abandoned analysis job {job.job_id}")
+                job.token.cancel("Analysis abandoned: no session is waiting for it")
+
+    def _run(self, job: AnalysisJob, crew: Any, on_done: list, analysis_kwargs: Dict[str, Any]) -> None:
+        try:
+            job.update("Starting", 0, 0)
+            result = crew.analyze_pitch_deck(progress_callback=job.update, cancel_token=job.token, **analysis_kwargs)
+            if result.get('report_path') and os.path.exists(result['report_path']):
+                # Finished jobs are kept for an hour; the report body is read from disk when shown
+                result = {key: value for key, value in result.items() if key != 'content'}
+            job.future.set_result(result)
+        except Exception as e:
+            logger.error(f"❌ Analysis job {job.job_id} failed: {e}")
+            job.future.set_exception(e)
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._running.pop(job.key, None)
+            for callback in on_done:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"❌ Cleanup for analysis job {job.job_id} failed: {e}")
+
+    def _prune(self) -> None:
+        cutoff = time.time() - FINISHED_JOB_TTL_SECONDS
+        for job_id in [j for j, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
@@ -0,0 +1,259 @@
+import time
+import logging
+import threading
+import contextvars
+from dataclasses import dataclass, field, replace
+from typing import Dict, Any, List, Optional, Callable
+from crewai import Agent, Task
+from .llm_pool import LLMPool, LLMSpec
+from .compaction import ContextCompactor
+from .research_cache import ResearchCache, detect_sector
+from .cancellation import CancellationToken, AnalysisCancelled
+
+
+logger = logging.getLogger('PitchDeckCrew.scheduler')
+
+CONTEXT_SEPARATOR = "\n\n----------\n\n"
+
+# How often a running task checks whether its analysis was cancelled
+CANCEL_POLL_SECONDS = 0.5
+# Deadline-capped LLM timeouts are rounded down to this step (whole seconds below it) so the pool stays small
+TIMEOUT_BUCKET_SECONDS = 15
+
+
+@dataclass
+class TaskPlan:
+    """A configured task together with the model it should run on."""
+    task_id: str
+    agent_id: str
+    task: Task
+    spec: LLMSpec
+    context_ids: List[str] = field(default_factory=list)
+    latency_budget: Optional[float] = None
+    fallback_spec: Optional[LLMSpec] = None
+    context_token_budget: Optional[int] = None
+    # Description/expected output templates (with ``{sector}``) for research shared across decks
+    sector_research: Optional[Dict[str, str]] = None
+
+
+class TaskScheduler:
+    """Run planned tasks in order, each on the LLM chosen for it.
+
+    Agents are built once per thread and reused by every later analysis on
+    that thread; an agent left running by an abandoned task is dropped.
+    """
+
+    def __init__(
+        self,
+        llm_pool: LLMPool,
+        agent_factory: Callable[[str, Any], Agent],
+        compactor: Optional[ContextCompactor] = None,
+        research_cache: Optional[ResearchCache] = None
+    ):
+        self.llm_pool = llm_pool
+        self.agent_factory = agent_factory
+        self.compactor = compactor or ContextCompactor()
+        self.research_cache = research_cache
+        # An agent keeps per-run executor state, so threads never share one
+        self._local = threading.local()
+
+    def agent(self, agent_id: str, spec: LLMSpec) -> Agent:
+        """The calling thread's agent for ``agent_id`` on ``spec``, built on first use."""
+        agents = self._agents()
+        key = (agent_id, spec)
+        if key not in agents:
+            agents[key] = self.agent_factory(agent_id, self.llm_pool.get(spec))
+        return agents[key]
+
+    def _agents(self) -> Dict[tuple, Agent]:
+        if not hasattr(self._local, 'agents'):
+            self._local.agents = {}
+        return self._local.agents
+
+    def run(
+        self,
+        plans: List[TaskPlan],
+        progress: Optional[Callable[[str, int, int], None]] = None,
+        token: Optional[CancellationToken] = None
+    ) -> Dict[str, str]:
+        """Execute every plan sequentially and return raw outputs keyed by task id.
+
+        ``progress(stage, completed, total)`` is called before each task starts.
+        If ``token`` is cancelled or its deadline passes, the running task is
+        abandoned and :class:`AnalysisCancelled` is raised carrying the
+        outputs of the tasks that did finish.
+        """
+        outputs: Dict[str, str] = {}
+        try:
+            self._run_plans(plans, outputs, progress, token)
+        except AnalysisCancelled as e:
+            logger.warning(f"🛑 Stopped after {len(outputs)}/{len(plans)} tasks: {e.reason}")
+            raise AnalysisCancelled(e.reason, completed=dict(outputs)) from e
+        if progress:
+            progress("Saving report", len(plans), len(plans))
+        return outputs
+
+    def _run_plans(
+        self,
+        plans: List[TaskPlan],
+        outputs: Dict[str, str],
+        progress: Optional[Callable[[str, int, int], None]],
+        token: Optional[CancellationToken]
+    ) -> None:
+        sector: Optional[str] = None
+
+        for index, plan in enumerate(plans):
+            if token:
+                token.check()
+            if progress:
+                progress(plan.task_id, index, len(plans))
+            context = self._build_context(plan, outputs)
+
+            if plan.sector_research and self.research_cache:
+                if sector is None:
+                    sector = detect_sector(" ".join(outputs[t] for t in plan.context_ids if t in outputs)) or ""
+                    logger.info(f"🏷️ Detected sector: {sector or 'unknown'}")
+                if sector:
+                    cached = self.research_cache.get_research(sector, plan.task_id)
+                    if cached is None:
+                        cached = self._research_sector(plan, sector, token)
+                    context = self._with_cached_research(sector, cached, context)
+
+            outputs[plan.task_id] = self._run_task(plan, context, token)
+
+    def _research_sector(
+        self,
+        plan: TaskPlan,
+        sector: str,
+        token: Optional[CancellationToken]
+    ) -> Dict[str, Any]:
+        """Run the task's sector-only prompt, without any deck context, and cache the result.
+
+        Only this output is shared between decks; the company-specific task
+        output never enters the cache.
+        """
+        logger.info(f"🔬 Researching sector {sector} for {plan.task_id}")
+        sector_plan = replace(
+            plan,
+            task_id=f"{plan.task_id}:sector",
+            task=Task(
+                description=plan.sector_research['description'].format(sector=sector),
+                expected_output=plan.sector_research['expected_output'].format(sector=sector)
+            ),
+            context_ids=[]
+        )
+        content = self._run_task(sector_plan, None, token)
+        self.research_cache.put_research(sector, plan.task_id, content)
+        return {"content": content, "created_at": time.time()}
+
+    @staticmethod
+    def _with_cached_research(sector: str, cached: Dict[str, Any], context: Optional[str]) -> Optional[str]:
+        """Prepend sector research so the task only researches the deck-specific delta."""
+        age_hours = (time.time() - cached['created_at']) / 3600
+        logger.info(f"♻️ Using {sector} research from {age_hours:.1f}h ago")
+        research = (
+            f"SHARED SECTOR RESEARCH ({sector}, {age_hours:.0f} hours old):\n{cached['content']}\n\n"
+            "Treat the sector research above as already done. Reuse it, and only research "
+            "what is specific to this company or has changed since."
+        )
+        return CONTEXT_SEPARATOR.join(part for part in (research, context) if part)
+
+    def _build_context(self, plan: TaskPlan, outputs: Dict[str, str]) -> Optional[str]:
+        """Join the upstream outputs this task depends on, compacted to its token budget."""
+        parts = [(task_id, outputs[task_id]) for task_id in plan.context_ids if task_id in outputs]
+        if not parts:
+            return None
+        return self.compactor.compact(parts, plan.context_token_budget, CONTEXT_SEPARATOR)
+
+    def _run_task(
+        self,
+        plan: TaskPlan,
+        context: Optional[str],
+        token: Optional[CancellationToken]
+    ) -> str:
+        """Run one task, falling back to a faster model when it is over budget."""
+        spec = plan.spec
+        use_fallback = plan.fallback_spec is not None and self.llm_pool.should_fallback(plan.task_id)
+        if use_fallback:
+            logger.info(f"⏩ {plan.task_id} recently exceeded its budget, using {plan.fallback_spec.model}")
+            spec = plan.fallback_spec
+        elif plan.latency_budget:
+            # A single call may not outlive the whole task's budget
+            spec = spec.with_overrides(timeout=min(spec.timeout, plan.latency_budget))
+
+        started = time.monotonic()
+        try:
+            output = self._execute(plan, spec, context, token)
+        except AnalysisCancelled:
+            raise
+        except Exception as e:
+            if use_fallback or plan.fallback_spec is None or not self._is_timeout(e):
+                raise
+            if token:
+                token.check()
+            logger.warning(f"⏱️ {plan.task_id} timed out on {spec.model}, retrying with {plan.fallback_spec.model}")
+            self.llm_pool.mark_breach(plan.task_id)
+            return self._execute(plan, plan.fallback_spec, context, token)
+
+        if not use_fallback:
+            self.llm_pool.record_latency(plan.task_id, time.monotonic() - started, plan.latency_budget)
+        return output
+
+    def _execute(
+        self,
+        plan: TaskPlan,
+        spec: LLMSpec,
+        context: Optional[str],
+        token: Optional[CancellationToken]
+    ) -> str:
+        if token and token.deadline is not None:
+            # No LLM call may outlive the analysis deadline
+            capped = token.cap(spec.timeout)
+            if capped < spec.timeout:
+                step = TIMEOUT_BUCKET_SECONDS if capped >= TIMEOUT_BUCKET_SECONDS else 1
+                spec = spec.with_overrides(timeout=float(capped // step * step))
+
+        agent = self.agent(plan.agent_id, spec)
+        logger.info(f"▶️ Running {plan.task_id} on {spec.model}")
+
+        if token is None:
+            return self._invoke(plan, agent, context)
+
+        # Run the task on a helper thread so a cancellation returns immediately;
+        # the agent itself stops at its next step via its step callback
+        outcome: Dict[str, Any] = {}
+
+        def target() -> None:
+            try:
+                outcome['output'] = self._invoke(plan, agent, context)
+            except BaseException as e:
+                outcome['error'] = e
+
+        worker = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(target,),
+            name=f"task-{plan.task_id}",
+            daemon=True
+        )
+        worker.start()
+        while True:
+            worker.join(CANCEL_POLL_SECONDS)
+            if not worker.is_alive():
+                break
+            if token.cancelled:
+                logger.warning(f"🛑 Abandoning {plan.task_id}: {token.reason}")
+                # The helper thread may still be using the agent, so the next analysis gets a fresh one
+                self._agents().pop((plan.agent_id, spec), None)
+                token.check()
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['output']
+
+    @staticmethod
+    def _invoke(plan: TaskPlan, agent: Agent, context: Optional[str]) -> str:
+        result = plan.task.execute_sync(agent=agent, context=context)
+        return result.raw if hasattr(result, 'raw') else str(result)
+
+    @staticmethod
+    def _is_timeout(error: Exception) -> bool:
+        return isinstance(error, TimeoutError) or 'timeout' in type(error).__name__.lower()
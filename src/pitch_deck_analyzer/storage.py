@@ -0,0 +1,63 @@
+import os
+import uuid
+from pathlib import Path
+from typing import Union
+
+
+DEFAULT_CACHE_DIR = "cache"
+DEFAULT_REPORTS_DIR = "reports"
+DEFAULT_UPLOADS_DIR = "uploads"
+DEFAULT_QUEUE_PATH = "jobs.sqlite3"
+DEFAULT_WORKER_SOCKET = "workers.sock"
+
+
+def cache_dir() -> Path:
+    """Cache directory shared by every API/worker process on this machine."""
+    return Path(os.getenv("PITCH_DECK_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def reports_dir() -> Path:
+    """Directory where finished reports are stored."""
+    return Path(os.getenv("PITCH_DECK_REPORTS_DIR", DEFAULT_REPORTS_DIR))
+
+
+def uploads_dir() -> Path:
+    """Directory where uploaded decks are stored."""
+    return Path(os.getenv("PITCH_DECK_UPLOADS_DIR", DEFAULT_UPLOADS_DIR))
+
+
+def queue_path() -> Path:
+    """SQLite database backing the local job queue."""
+    return Path(os.getenv("PITCH_DECK_QUEUE_PATH", DEFAULT_QUEUE_PATH))
+
+
+def worker_socket_path() -> Path:
+    """Unix socket on which the worker pool is told that jobs are waiting."""
+    return Path(os.getenv("PITCH_DECK_WORKER_SOCKET", DEFAULT_WORKER_SOCKET))
+
+
+def new_id() -> str:
+    """Collision-free identifier for analyses, jobs and files."""
+    return uuid.uuid4().hex[:16]
+
+
+def atomic_write(path: Union[str, Path], data: Union[str, bytes]) -> Path:
+    """Write ``data`` to ``path`` so concurrent readers never see a partial file.
+
+    The data goes to a process-unique temporary file in the same directory,
+    which is then renamed over the target in one step.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    try:
+        with open(tmp_path, mode, **({} if isinstance(data, bytes) else {'encoding': 'utf-8'})) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
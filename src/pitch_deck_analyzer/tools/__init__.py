@@ -1,4 +1,18 @@
-from .file_processor import FileProcessor
-from .website_audit import WebsiteAuditTool
+import importlib
 
-__all__ = ["FileProcessor", "WebsiteAuditTool"]
\ No newline at end of file
+# Tools are imported on first use, so the pure text helpers in this package
+# can be used without loading crewai
+_EXPORTS = {
+    "FileProcessor": ".file_processor",
+    "WebsiteAuditTool": ".website_audit",
+    "CachedSearchTool": ".cached_search",
+    "LocalSearchTool": ".cached_search",
+}
+
+__all__ = ["FileProcessor", "WebsiteAuditTool", "CachedSearchTool", "LocalSearchTool"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,73 @@
+import os
+import json
+import logging
+from pathlib import Path
+from crewai.tools import BaseTool
+from typing import Any, Optional
+from ..cancellation import current_token
+
+
+logger = logging.getLogger('PitchDeckCrew.tools')
+
+
+class CachedSearchTool(BaseTool):
+    """Wrap a search tool so identical queries are served from the research cache."""
+    name: str = "cached_search"
+    description: str = "Search the web, reusing recent results for identical queries"
+    tool: Any = None
+    cache: Any = None
+
+    def __init__(self, tool: BaseTool, cache: Any, **kwargs: Any):
+        super().__init__(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            tool=tool,
+            cache=cache,
+            **kwargs
+        )
+
+    def _run(self, **kwargs: Any) -> str:
+        token = current_token()
+        if token:
+            token.check()
+
+        cached = self.cache.get_search(self.tool.name, kwargs)
+        if cached is not None:
+            logger.debug(f"Search cache hit for {self.tool.name}: {kwargs}")
+            return cached
+
+        result = self.tool.run(**kwargs)
+        self.cache.put_search(self.tool.name, kwargs, str(result))
+        return result
+
+
+class LocalSearchTool(BaseTool):
+    """Offline stand-in for the Serper search API, answering from local JSON fixtures.
+
+    Set ``LOCAL_SEARCH_FIXTURES`` to a directory of ``*.json`` files, each a
+    list of ``{"title", "link", "snippet"}`` results. A query is answered from
+    the fixture whose file name appears in it, falling back to ``default.json``.
+    """
+    name: str = "Search the internet"
+    description: str = "Search the internet for a query and return the top results"
+    fixtures_dir: str = ""
+
+    def __init__(self, fixtures_dir: Optional[str] = None, **kwargs: Any):
+        super().__init__(fixtures_dir=fixtures_dir or os.getenv("LOCAL_SEARCH_FIXTURES", ""), **kwargs)
+
+    def _run(self, search_query: str = "", **kwargs: Any) -> str:
+        fixtures = Path(self.fixtures_dir)
+        lowered = search_query.lower()
+        matches = [p for p in sorted(fixtures.glob("*.json")) if p.stem.lower().replace('_', ' ') in lowered]
+        path = matches[0] if matches else fixtures / "default.json"
+        if not path.exists():
+            return f"No results found for: {search_query}"
+
+        with open(path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+
+        return "\n\n".join(
+            f"Title: {r.get('title', '')}\nLink: {r.get('link', '')}\nSnippet: {r.get('snippet', '')}"
+            for r in results
+        )
@@ -1,47 +1,124 @@
 import os
+import logging
 from pathlib import Path
 from crewai.tools import BaseTool
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
+import PyPDF2
+from pptx import Presentation
+from pptx.shapes.picture import Picture
+from docx import Document
+from .text_normalizer import normalize_pages
+from .ocr import get_ocr_engine, has_text_layer
+
+
+logger = logging.getLogger('PitchDeckCrew.tools')
+
 
 class FileProcessor(BaseTool):
     name: str = "file_processor"
     description: str = "Process and extract content from uploaded files (PDF, PPTX, DOCX)"
-    
+
     def _run(self, file_path: str) -> str:
         """Process a file and extract its content for analysis."""
         try:
             if not os.path.exists(file_path):
                 return f"Error: File not found at {file_path}"
-            
+
             file_ext = Path(file_path).suffix.lower()
             file_size = os.path.getsize(file_path)
-            
-            # For now, return basic file information
-            # In a real implementation, you would extract actual content based on file type
+
+            pages = self.extract_pages(file_path)
+            pages, stats = normalize_pages(pages)
+            logger.info(
+                f"🧹 Normalized {len(pages)} pages: removed {stats.repeated_lines_removed} boilerplate lines "
+                f"and {stats.duplicate_pages_removed} duplicate pages, saving ~{stats.tokens_saved} tokens"
+            )
+
+            content = "\n\n".join(
+                f"--- Page {number} ---\n{text}" for number, text in enumerate(pages, start=1) if text
+            )
+
             result = f"""
 FILE PROCESSING RESULTS:
 ========================
 File Path: {file_path}
 File Type: {file_ext}
 File Size: {file_size} bytes
+Pages: {len(pages)}
+Tokens Saved By Normalization: ~{stats.tokens_saved} of ~{stats.tokens_before}
 Status: Successfully processed
 
-EXTRACTED CONTENT SUMMARY:
-=========================
-This is a {file_ext} file containing a pitch deck presentation.
-The file appears to be properly formatted and readable.
-
-Note: This is a simplified processor. In production, this would:
-- Extract text from PDF using PyPDF2 or pdfplumber
-- Parse PowerPoint slides using python-pptx
-- Read Word documents using python-docx
-- Perform OCR on image-based content
-- Structure the content for analysis
-
-ANALYSIS READY: The file has been processed and is ready for detailed analysis.
+EXTRACTED CONTENT:
+==================
+{content or 'No text could be extracted from this file.'}
             """
-            
+
             return result.strip()
-            
+
         except Exception as e:
-            return f"Error processing file: {str(e)}"
\ No newline at end of file
+            return f"Error processing file: {str(e)}"
+
+    def extract_pages(self, file_path: str) -> List[str]:
+        """Extract text per page/slide, using OCR only for pages without a usable text layer."""
+        pages = self.extract_text_layer(file_path)
+        missing = [index for index, text in enumerate(pages) if not has_text_layer(text)]
+        if not missing:
+            return pages
+
+        engine = get_ocr_engine()
+        if not engine.available:
+            logger.warning(
+                f"{len(missing)} of {len(pages)} pages have no text layer; "
+                f"install pytesseract, Pillow and tesseract to OCR them"
+            )
+            return pages
+
+        images = self.page_images(file_path, missing)
+        flat = [data for index in missing for data in images.get(index, [])]
+        if not flat:
+            return pages
+        texts = iter(engine.recognize(flat))
+        recovered = 0
+        for index in missing:
+            recognized = "\n".join(next(texts) for _ in images.get(index, []))
+            if recognized.strip():
+                pages[index] = f"{pages[index]}\n{recognized}".strip()
+                recovered += 1
+        logger.info(f"🔎 OCR recovered text for {recovered} of {len(missing)} pages without a text layer")
+        return pages
+
+    def page_images(self, file_path: str, indices: List[int]) -> Dict[int, List[bytes]]:
+        """Embedded images of the given pages/slides, as encoded image bytes."""
+        file_ext = Path(file_path).suffix.lower()
+        images: Dict[int, List[bytes]] = {}
+        if file_ext == '.pdf':
+            with open(file_path, 'rb') as f:
+                reader = PyPDF2.PdfReader(f)
+                for index in indices:
+                    try:
+                        images[index] = [image.data for image in reader.pages[index].images]
+                    except Exception as e:
+                        logger.warning(f"Could not read images on page {index + 1}: {e}")
+        elif file_ext == '.pptx':
+            slides = list(Presentation(file_path).slides)
+            for index in indices:
+                images[index] = [shape.image.blob for shape in slides[index].shapes if isinstance(shape, Picture)]
+        return images
+
+    def extract_text_layer(self, file_path: str) -> List[str]:
+        """Extract raw text per page/slide from a PDF, PPTX or DOCX file."""
+        file_ext = Path(file_path).suffix.lower()
+        if file_ext == '.pdf':
+            with open(file_path, 'rb') as f:
+                reader = PyPDF2.PdfReader(f)
+                return [page.extract_text() or "" for page in reader.pages]
+        if file_ext == '.pptx':
+            slides = []
+            for slide in Presentation(file_path).slides:
+                texts = [shape.text for shape in slide.shapes if getattr(shape, 'has_text_frame', False)]
+                slides.append("\n".join(texts))
+            return slides
+        if file_ext == '.docx':
+            # Word documents have no reliable page boundaries; treat as one page
+            return ["\n".join(p.text for p in Document(file_path).paragraphs)]
+        raise ValueError(f"Unsupported file format: {file_ext}")
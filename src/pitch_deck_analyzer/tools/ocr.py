@@ -0,0 +1,105 @@
+import io
+import os
+import re
+import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from ..storage import cache_dir, atomic_write
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:  # OCR is optional: pip install pytesseract Pillow, plus the tesseract binary
+    pytesseract = None
+
+
+logger = logging.getLogger('PitchDeckCrew.tools')
+
+# Pages with fewer letters/digits than this are treated as having no text layer
+MIN_TEXT_CHARS = 20
+DEFAULT_OCR_LANGUAGE = "eng"
+
+
+def has_text_layer(text: str) -> bool:
+    """Whether extracted page text is enough to analyse without OCR."""
+    return len(re.findall(r'\w', text or "")) >= MIN_TEXT_CHARS
+
+
+def _recognize(data: bytes, language: str) -> str:
+    with Image.open(io.BytesIO(data)) as image:
+        return pytesseract.image_to_string(image, lang=language)
+
+
+class OCREngine:
+    """Local Tesseract OCR for page images, cached on disk by image hash.
+
+    Each recognition runs in its own ``tesseract`` process, so a thread pool
+    is enough to keep every core busy, and it also works inside the daemonic
+    analysis worker processes, which may not start child processes of their own.
+    """
+
+    def __init__(
+        self,
+        cache_root: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
+        language: Optional[str] = None
+    ):
+        self.cache_root = Path(cache_root or cache_dir() / "ocr")
+        self.max_workers = max_workers or int(os.getenv("PITCH_DECK_OCR_WORKERS") or os.cpu_count() or 1)
+        self.language = language or os.getenv("PITCH_DECK_OCR_LANGUAGE") or DEFAULT_OCR_LANGUAGE
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return pytesseract is not None and shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+
+    def recognize(self, images: List[bytes]) -> List[str]:
+        """OCR each image, reusing cached text for images seen before."""
+        digests = [hashlib.sha256(data).hexdigest() for data in images]
+        texts: Dict[str, str] = {}
+        todo: Dict[str, bytes] = {}
+        for digest, data in zip(digests, images):
+            cached = self._cache_path(digest)
+            if cached.exists():
+                texts[digest] = cached.read_text(encoding='utf-8')
+            else:
+                todo[digest] = data
+
+        if todo:
+            executor = self._get_executor()
+            futures = {digest: executor.submit(_recognize, data, self.language) for digest, data in todo.items()}
+            for digest, future in futures.items():
+                try:
+                    texts[digest] = future.result().strip()
+                    atomic_write(self._cache_path(digest), texts[digest])
+                except Exception as e:
+                    # Unreadable or unsupported images are skipped rather than failing the deck
+                    logger.warning(f"OCR failed for image {digest[:12]}: {e}")
+                    texts[digest] = ""
+
+        logger.info(f"🔎 OCR read {len(images)} images ({len(images) - len(todo)} cached)")
+        return [texts[digest] for digest in digests]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Concurrent analyses in one process share the engine, so only one pool may be created
+        with self._lock:
+            if self._executor is None:
+                # One page per tesseract process; its own threading would only oversubscribe the cores
+                os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ocr")
+            return self._executor
+
+    def _cache_path(self, digest: str) -> Path:
+        return self.cache_root / f"{digest}.{self.language}.txt"
+
+
+@lru_cache(maxsize=1)
+def get_ocr_engine() -> OCREngine:
+    """OCR engine shared by every file processor in this process."""
+    return OCREngine()
@@ -0,0 +1,143 @@
+import re
+import hashlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Tuple
+from ..compaction import estimate_tokens
+
+
+# A line on at least this share of pages (and on at least MIN_REPEATED_PAGES) is treated as boilerplate
+REPEATED_LINE_RATIO = 0.5
+MIN_REPEATED_PAGES = 3
+# Estimated Jaccard similarity above which a later page is dropped as a duplicate
+NEAR_DUPLICATE_THRESHOLD = 0.9
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), 'big') % _MERSENNE_PRIME | 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), 'big') % _MERSENNE_PRIME
+    )
+    for i in range(NUM_PERMUTATIONS)
+]
+
+# "Page 3", "Slide 3 of 12", "3 / 12"; a bare "3" is only a page number if it follows the page sequence
+PAGE_NUMBER_PATTERN = re.compile(r'^(?:(?:page|slide)\s*\d+(?:\s*(?:/|of)\s*\d+)?|\d+\s*(?:/|of)\s*\d+)$', re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+DIGITS_PATTERN = re.compile(r'\d+')
+# Footers whose numbers change from page to page: "Acme | 3", "Page 3", "© 2024 Acme", "Confidential - 3"
+FOOTER_PATTERN = re.compile(
+    r'(?:\b(?:page|slide|confidential|copyright|all rights reserved)\b|©|\(c\)|[|•·]\s*\d+\s*$|^\d+\s*[|•·])',
+    re.IGNORECASE
+)
+
+
+@dataclass
+class NormalizationStats:
+    """What the normalization pass removed from a document."""
+    tokens_before: int = 0
+    tokens_after: int = 0
+    repeated_lines_removed: int = 0
+    duplicate_pages_removed: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def normalize_pages(pages: List[str]) -> Tuple[List[str], NormalizationStats]:
+    """Strip per-slide boilerplate and duplicate content from extracted page text.
+
+    Returns the cleaned pages (empty pages are kept so slide numbers stay
+    aligned) and statistics about what was removed.
+    """
+    stats = NormalizationStats(tokens_before=sum(estimate_tokens(p) for p in pages))
+
+    page_lines = [_clean_lines(page) for page in pages]
+    _drop_bare_page_numbers(page_lines)
+    boilerplate = _find_repeated_lines(page_lines)
+
+    cleaned_pages = []
+    for lines in page_lines:
+        kept = [line for line in lines if _line_key(line) not in boilerplate]
+        stats.repeated_lines_removed += len(lines) - len(kept)
+        cleaned_pages.append("\n".join(kept))
+
+    signatures = []
+    for index, page in enumerate(cleaned_pages):
+        signature = _minhash(page)
+        if signature and any(_similarity(signature, other) >= NEAR_DUPLICATE_THRESHOLD for other in signatures):
+            cleaned_pages[index] = ""
+            stats.duplicate_pages_removed += 1
+            continue
+        if signature:
+            signatures.append(signature)
+
+    stats.tokens_after = sum(estimate_tokens(p) for p in cleaned_pages)
+    return cleaned_pages, stats
+
+
+def _clean_lines(page: str) -> List[str]:
+    """Collapse whitespace, drop page numbers and repeated lines within one page."""
+    lines = []
+    seen = set()
+    for raw_line in page.splitlines():
+        line = WHITESPACE_PATTERN.sub(' ', raw_line).strip()
+        if not line or PAGE_NUMBER_PATTERN.match(line):
+            continue
+        # PDF exports with several text layers repeat the same line on a page
+        if line in seen:
+            continue
+        seen.add(line)
+        lines.append(line)
+    return lines
+
+
+def _drop_bare_page_numbers(page_lines: List[List[str]]) -> None:
+    """Remove lines that are just the page's own number, if enough pages carry one.
+
+    A standalone number on a single slide is usually a metric ("500"
+    above "enterprise customers") and is kept.
+    """
+    numbered = [index for index, lines in enumerate(page_lines) if str(index + 1) in lines]
+    if len(numbered) < MIN_REPEATED_PAGES:
+        return
+    for index in numbered:
+        page_lines[index].remove(str(index + 1))
+
+
+def _line_key(line: str) -> str:
+    """Key used to spot the same line across pages.
+
+    Numbers are ignored only in footer-like lines; anywhere else they are
+    content (revenue, users, growth) and lines must match exactly.
+    """
+    line = line.lower()
+    return DIGITS_PATTERN.sub('#', line) if FOOTER_PATTERN.search(line) else line
+
+
+def _find_repeated_lines(page_lines: List[List[str]]) -> set:
+    non_empty = sum(1 for lines in page_lines if lines)
+    if non_empty < MIN_REPEATED_PAGES:
+        return set()
+    counts = Counter(key for lines in page_lines for key in {_line_key(line) for line in lines})
+    threshold = max(MIN_REPEATED_PAGES, REPEATED_LINE_RATIO * non_empty)
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def _minhash(text: str) -> Tuple[int, ...]:
+    """MinHash signature over word shingles, or ``()`` for very short text."""
+    words = text.lower().split()
+    if len(words) < SHINGLE_SIZE:
+        return ()
+    hashes = {
+        int.from_bytes(hashlib.blake2b(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'), digest_size=8).digest(), 'big')
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def _similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
@@ -2,6 +2,10 @@ from crewai.tools import BaseTool
 from typing import Any, Optional
 import requests
 from urllib.parse import urlparse
+from ..cancellation import AnalysisCancelled, current_token
+
+# Upper bound for a single fetch; shortened further by the analysis deadline
+REQUEST_TIMEOUT_SECONDS = 10
 
 class WebsiteAuditTool(BaseTool):
     name: str = "website_audit"
@@ -18,9 +22,15 @@ class WebsiteAuditTool(BaseTool):
             if not parsed_url.netloc:
                 return "Error: Invalid URL format"
             
+            # Skip the fetch entirely if the analysis has already been stopped
+            token = current_token()
+            if token:
+                token.check()
+            timeout = token.cap(REQUEST_TIMEOUT_SECONDS) if token else REQUEST_TIMEOUT_SECONDS
+            
             # Try to fetch basic information
             try:
-                response = requests.get(url, timeout=10, headers={
+                response = requests.get(url, timeout=timeout, headers={
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 })
                 
@@ -65,5 +75,7 @@ RECOMMENDATIONS:
             except requests.RequestException as e:
                 return f"Website audit failed: Unable to access {url}. Error: {str(e)}"
                 
+        except AnalysisCancelled:
+            raise
         except Exception as e:
             return f"Website audit error: {str(e)}"
\ No newline at end of file
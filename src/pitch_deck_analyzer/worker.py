@@ -0,0 +1,255 @@
+import os
+import sys
+import time
+import socket
+import logging
+import argparse
+import threading
+import multiprocessing
+import multiprocessing.connection
+from pathlib import Path
+from typing import List, Optional
+from .crew import PitchDeckCrew
+from .job_queue import JobQueue, HEARTBEAT_SECONDS
+from .blob_store import BlobStore
+from .storage import worker_socket_path
+from .logging_config import configure_logging
+from .cancellation import CancellationToken
+
+
+logger = logging.getLogger('PitchDeckCrew.worker')
+
+DEFAULT_POLL_INTERVAL = 1.0
+CANCEL_POLL_SECONDS = 1.0
+# Workers are replaced after this many jobs or once they use this much memory, to contain leaks
+DEFAULT_MAX_JOBS = 50
+DEFAULT_MAX_RSS_MB = 2048
+# A worker that dies sooner than this after starting is restarted only after the same delay
+RESTART_BACKOFF_SECONDS = 5.0
+# Imported once by the fork server so every worker starts with them loaded
+FORKSERVER_PRELOAD = ["crewai", "crewai_tools"]
+
+
+def _watch_job(queue: JobQueue, job_id: str, worker_id: str, token: CancellationToken, done: threading.Event) -> None:
+    """Keep ``job_id``'s heartbeat fresh and cancel ``token`` when someone asks the queue to stop it."""
+    last_beat = time.monotonic()
+    while not done.wait(CANCEL_POLL_SECONDS):
+        if queue.is_cancel_requested(job_id):
+            token.cancel("Analysis cancelled by the client")
+            return
+        if time.monotonic() - last_beat >= HEARTBEAT_SECONDS:
+            queue.heartbeat(job_id, worker_id)
+            last_beat = time.monotonic()
+
+
+def _rss_mb() -> float:
+    """Resident memory of this process in MiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def _wait_for_work(wakeup: Optional[socket.socket], timeout: float) -> None:
+    """Sleep until a job is announced on ``wakeup`` or ``timeout`` passes."""
+    if wakeup is None:
+        time.sleep(timeout)
+        return
+    wakeup.settimeout(timeout)
+    try:
+        wakeup.recv(64)
+    except socket.timeout:
+        pass
+
+
+def worker_loop(
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_jobs: Optional[int] = None,
+    max_rss_mb: Optional[float] = None,
+    wakeup: Optional[socket.socket] = None,
+    slot: Optional[int] = None,
+    ocr_workers: Optional[int] = None
+) -> None:
+    """Claim and run analyses from the shared queue until ``max_jobs`` have run or memory exceeds ``max_rss_mb``.
+
+    Workers log to a file named after their pool ``slot``, which the
+    worker that replaces this one keeps appending to.
+    """
+    configure_logging(process_name=f"worker-{os.getpid() if slot is None else slot}")
+    if ocr_workers and not os.getenv("PITCH_DECK_OCR_WORKERS"):
+        # The pool's workers share the cores, so each gets its share of OCR threads
+        os.environ["PITCH_DECK_OCR_WORKERS"] = str(ocr_workers)
+    crew = PitchDeckCrew()
+    crew.warm_up()
+    queue = JobQueue()
+    blobs = BlobStore()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"👷 Worker {worker_id} ready")
+
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = queue.claim(worker_id)
+        if job is None:
+            _wait_for_work(wakeup, poll_interval)
+            continue
+
+        logger.info(f"👷 Worker {worker_id} running job {job.id}")
+        payload = dict(job.payload)
+        # The upload's lease started when the job was queued; restart it now the job is running
+        blobs.acquire(Path(payload["pitch_deck_path"]).stem, f"job:{job.id}")
+        # The deadline is absolute, so time spent waiting in the queue counts against it
+        token = CancellationToken(deadline=payload.pop("deadline_at", None))
+        done = threading.Event()
+        watcher = threading.Thread(target=_watch_job, args=(queue, job.id, worker_id, token, done), daemon=True)
+        watcher.start()
+        try:
+            result = crew.analyze_pitch_deck(cancel_token=token, **payload)
+        except Exception as e:
+            # analyze_pitch_deck reports its own errors; this guards the loop itself
+            result = {"status": "error", "message": f"Worker error: {e}", "error_type": type(e).__name__}
+        finally:
+            done.set()
+        queue.complete(job.id, result)
+        blobs.release(f"job:{job.id}")
+        processed += 1
+
+        rss = _rss_mb()
+        if max_rss_mb and rss > max_rss_mb:
+            logger.info(f"♻️ Worker {worker_id} retiring at {rss:.0f} MiB after {processed} jobs")
+            return
+    logger.info(f"♻️ Worker {worker_id} retiring after {processed} jobs")
+
+
+class WorkerPool:
+    """Pre-forked pool of warm analysis workers fed from the shared job queue.
+
+    Workers, including replacements, are forked from a single-threaded fork
+    server that has already imported crewai, so no worker inherits a lock held
+    by one of the parent's threads (the log listener, uvicorn's supervisor).
+    Each builds its crew, tools, agents and LLM clients once, before taking
+    its first job.
+    Idle workers block on a Unix datagram socket that ``JobQueue.enqueue``
+    pings, so a new job is claimed at once rather than at the next poll. A
+    worker retires after ``max_jobs`` jobs or above ``max_rss_mb`` and the pool
+    starts a fresh one in its place.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_jobs: Optional[int] = None,
+        max_rss_mb: Optional[float] = None
+    ):
+        self.count = count
+        self.poll_interval = poll_interval
+        self.max_jobs = max_jobs or int(os.getenv("PITCH_DECK_WORKER_MAX_JOBS", DEFAULT_MAX_JOBS))
+        self.max_rss_mb = max_rss_mb or float(os.getenv("PITCH_DECK_WORKER_MAX_RSS_MB", DEFAULT_MAX_RSS_MB))
+        self.socket_path = worker_socket_path()
+        self.ocr_workers = max(1, (os.cpu_count() or 1) // count)
+        forkserver = "forkserver" in multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("forkserver" if forkserver else None)
+        if forkserver:
+            # Third-party imports only: the crew module starts a log listener thread when imported
+            self._context.set_forkserver_preload(FORKSERVER_PRELOAD)
+        self._wakeup: Optional[socket.socket] = None
+        self._processes: List[multiprocessing.Process] = []
+        self._started_at: List[float] = []
+        self._stopping = threading.Event()
+        self._supervisor: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Fork the workers and keep the pool at full strength in a background thread."""
+        self._wakeup = self._bind_wakeup()
+        for slot in range(self.count):
+            self._processes.append(self._spawn(slot))
+            self._started_at.append(time.monotonic())
+        self._supervisor = threading.Thread(target=self._supervise, name="worker-pool", daemon=True)
+        self._supervisor.start()
+        logger.info(f"Started {self.count} analysis workers (recycled after {self.max_jobs} jobs or {self.max_rss_mb:.0f} MiB)")
+
+    def _bind_wakeup(self) -> Optional[socket.socket]:
+        # Every worker is handed the bound socket and the kernel delivers each datagram to one of them
+        if not hasattr(socket, 'AF_UNIX') or self._context.get_start_method() != "forkserver":
+            logger.warning("Worker wakeups need Unix sockets and a fork server; workers will poll the queue instead")
+            return None
+        self.socket_path.unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(str(self.socket_path))
+        return sock
+
+    def _spawn(self, slot: int) -> multiprocessing.Process:
+        process = self._context.Process(
+            target=worker_loop,
+            args=(self.poll_interval, self.max_jobs, self.max_rss_mb, self._wakeup, slot, self.ocr_workers),
+            name=f"pitch-deck-worker-{slot}",
+            daemon=True
+        )
+        process.start()
+        return process
+
+    def _supervise(self) -> None:
+        while not self._stopping.is_set():
+            multiprocessing.connection.wait([p.sentinel for p in self._processes], timeout=1.0)
+            for slot, process in enumerate(self._processes):
+                if process.is_alive() or self._stopping.is_set():
+                    continue
+                process.join()
+                if process.exitcode != 0:
+                    logger.warning(f"Worker {process.pid} exited with code {process.exitcode}")
+                    if time.monotonic() - self._started_at[slot] < RESTART_BACKOFF_SECONDS:
+                        self._stopping.wait(RESTART_BACKOFF_SECONDS)
+                        if self._stopping.is_set():
+                            return
+                self._processes[slot] = self._spawn(slot)
+                self._started_at[slot] = time.monotonic()
+
+    def join(self) -> None:
+        """Block until the pool is stopped, stopping it on Ctrl+C."""
+        try:
+            while not self._stopping.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            self.stop()
+
+    def stop(self) -> None:
+        """Terminate every worker and remove the wakeup socket."""
+        self._stopping.set()
+        if self._supervisor is not None:
+            self._supervisor.join()
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join()
+        if self._wakeup is not None:
+            self._wakeup.close()
+            self.socket_path.unlink(missing_ok=True)
+
+
+def run_workers(
+    count: int,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_jobs: Optional[int] = None,
+    max_rss_mb: Optional[float] = None
+) -> None:
+    """Run a pool of ``count`` worker processes until interrupted."""
+    pool = WorkerPool(count, poll_interval, max_jobs, max_rss_mb)
+    pool.start()
+    pool.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run pitch deck analysis workers")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    parser.add_argument("--max-jobs", type=int, default=None, help="Jobs a worker runs before it is replaced")
+    parser.add_argument("--max-memory-mb", type=float, default=None, help="Memory above which a worker is replaced")
+    args = parser.parse_args()
+    run_workers(args.workers, args.poll_interval, args.max_jobs, args.max_memory_mb)
+
+
+if __name__ == "__main__":
+    main()
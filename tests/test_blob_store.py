@@ -0,0 +1,100 @@
+import os
+import time
+from contextlib import closing
+from pathlib import Path
+
+from pitch_deck_analyzer.blob_store import BlobStore
+
+
+DECK = b"%PDF-1.4 pitch deck"
+OTHER_DECK = b"%PDF-1.4 another pitch deck"
+
+
+def _age(store, blob, seconds):
+    """Pretend ``blob`` was last used ``seconds`` ago."""
+    with closing(store._connect()) as conn:
+        conn.execute("UPDATE blobs SET last_used_at = ? WHERE digest = ?", (time.time() - seconds, blob.digest))
+
+
+def test_identical_uploads_are_stored_once(tmp_path):
+    store = BlobStore(tmp_path)
+
+    first = store.put(DECK, "Deck.PDF", owner="job:1")
+    second = store.put(DECK, "renamed.pdf", owner="job:2")
+
+    assert first == second
+    assert Path(first.path).name == f"{first.digest}.pdf"
+    assert Path(first.path).read_bytes() == DECK
+    assert [path.name for path in tmp_path.glob("*.pdf")] == [Path(first.path).name]
+
+
+def test_released_uploads_are_removed_once_too_old(tmp_path):
+    store = BlobStore(tmp_path, max_age_hours=1)
+    blob = store.put(DECK, "deck.pdf", owner="job:1")
+    _age(store, blob, 2 * 3600)
+
+    assert store.collect() == (0, 0)
+    assert Path(blob.path).exists()
+
+    store.release("job:1")
+    _age(store, blob, 2 * 3600)
+
+    assert store.collect() == (1, len(DECK))
+    assert not Path(blob.path).exists()
+
+
+def test_release_keeps_uploads_other_owners_still_reference(tmp_path):
+    store = BlobStore(tmp_path, max_age_hours=1)
+    blob = store.put(DECK, "deck.pdf", owner="job:1")
+    store.acquire(blob.digest, "analysis:abc")
+
+    store.release("job:1")
+    _age(store, blob, 2 * 3600)
+
+    assert store.collect() == (0, 0)
+    assert Path(blob.path).exists()
+
+
+def test_expired_leases_stop_pinning_uploads(tmp_path):
+    store = BlobStore(tmp_path, max_age_hours=1)
+    blob = store.put(DECK, "deck.pdf", owner="job:1", lease=-1)
+    _age(store, blob, 2 * 3600)
+
+    assert store.collect() == (1, len(DECK))
+    assert not Path(blob.path).exists()
+
+
+def test_least_recently_used_uploads_go_first_beyond_the_size_quota(tmp_path):
+    store = BlobStore(tmp_path, max_bytes=len(DECK) + len(OTHER_DECK) - 1)
+    old = store.put(DECK, "old.pdf")
+    new = store.put(OTHER_DECK, "new.pdf")
+    _age(store, old, 60)
+
+    assert store.collect() == (1, len(DECK))
+    assert not Path(old.path).exists()
+    assert Path(new.path).exists()
+
+
+def test_referenced_uploads_survive_the_size_quota(tmp_path):
+    store = BlobStore(tmp_path, max_bytes=1)
+    pinned = store.put(DECK, "pinned.pdf", owner="job:1")
+    unpinned = store.put(OTHER_DECK, "unpinned.pdf")
+
+    assert store.collect() == (1, len(OTHER_DECK))
+    assert Path(pinned.path).exists()
+    assert not Path(unpinned.path).exists()
+
+
+def test_old_stray_files_are_removed_but_others_are_kept(tmp_path):
+    store = BlobStore(tmp_path, max_age_hours=1)
+    legacy = tmp_path / "0123456789abcdef_deck.pdf"
+    partial = tmp_path / ".upload.pdf.tmp"
+    sample = tmp_path / "sample.pdf"
+    for path in (legacy, partial, sample):
+        path.write_bytes(DECK)
+        os.utime(path, (time.time() - 2 * 3600,) * 2)
+
+    assert store.collect() == (0, 2 * len(DECK))
+    assert not legacy.exists()
+    assert not partial.exists()
+    assert sample.exists()
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.tools import BaseTool  # noqa: E402
+
+from pitch_deck_analyzer.cancellation import (  # noqa: E402
+    AnalysisCancelled, CancellationToken, reset_current_token, set_current_token
+)
+from pitch_deck_analyzer.research_cache import ResearchCache  # noqa: E402
+from pitch_deck_analyzer.tools.cached_search import CachedSearchTool, LocalSearchTool  # noqa: E402
+
+
+class CountingSearchTool(BaseTool):
+    name: str = "Search the internet"
+    description: str = "Counts how often it is really called"
+    calls: int = 0
+
+    def _run(self, search_query: str = "") -> str:
+        self.calls += 1
+        return f"result {self.calls} for {search_query}"
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path):
+    directory = tmp_path / "fixtures"
+    directory.mkdir()
+    (directory / "fintech.json").write_text(json.dumps([
+        {"title": "UPI growth", "link": "https://example.com/upi", "snippet": "UPI crossed 10B transactions"}
+    ]))
+    (directory / "default.json").write_text(json.dumps([
+        {"title": "Generic", "link": "https://example.com", "snippet": "Nothing specific"}
+    ]))
+    return directory
+
+
+def test_local_search_answers_from_matching_fixture(fixtures_dir):
+    tool = LocalSearchTool(fixtures_dir=str(fixtures_dir))
+
+    assert "UPI crossed 10B transactions" in tool.run(search_query="India fintech market size")
+    assert "Nothing specific" in tool.run(search_query="edtech trends")
+
+
+def test_cached_search_reuses_identical_queries(tmp_path):
+    inner = CountingSearchTool()
+    tool = CachedSearchTool(inner, ResearchCache(root_dir=str(tmp_path)))
+
+    first = tool.run(search_query="UPI market size")
+    second = tool.run(search_query="upi   market size")
+
+    assert first == second
+    assert inner.calls == 1
+    assert tool.name == inner.name
+
+
+def test_cached_search_stops_when_analysis_is_cancelled(tmp_path):
+    inner = CountingSearchTool()
+    tool = CachedSearchTool(inner, ResearchCache(root_dir=str(tmp_path)))
+    token = CancellationToken()
+    token.cancel("stop")
+    reset = set_current_token(token)
+    try:
+        with pytest.raises(AnalysisCancelled):
+            tool.run(search_query="UPI market size")
+    finally:
+        reset_current_token(reset)
+    assert inner.calls == 0
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from pitch_deck_analyzer.cancellation import (
+    AnalysisCancelled, CancellationToken, current_token, reset_current_token, set_current_token
+)
+
+
+def test_token_without_deadline_never_expires():
+    token = CancellationToken()
+
+    assert token.remaining() is None
+    assert token.cap(120) == 120
+    assert not token.cancelled
+    token.check()
+
+
+def test_cap_shortens_timeouts_to_the_deadline_but_not_below_a_second():
+    token = CancellationToken.with_timeout(30)
+
+    assert 29 < token.cap(120) <= 30
+    assert token.cap(10) == 10
+    assert CancellationToken(deadline=time.time() - 5).cap(120) == 1.0
+
+
+def test_passing_the_deadline_cancels_the_token():
+    token = CancellationToken.with_timeout(0.05)
+    assert not token.cancelled
+
+    time.sleep(0.1)
+
+    assert token.cancelled
+    assert token.remaining() == 0.0
+    with pytest.raises(AnalysisCancelled, match="deadline exceeded"):
+        token.check()
+
+
+def test_first_cancel_reason_wins():
+    token = CancellationToken()
+    token.cancel("Analysis cancelled by the client")
+    token.cancel("Analysis deadline exceeded")
+
+    with pytest.raises(AnalysisCancelled) as raised:
+        token.check()
+    assert raised.value.reason == "Analysis cancelled by the client"
+
+
+def test_wait_returns_early_on_cancel_and_stops_at_the_deadline():
+    token = CancellationToken.with_timeout(0.05)
+    started = time.monotonic()
+
+    assert token.wait(5)
+    assert time.monotonic() - started < 1
+
+
+def test_current_token_is_scoped_to_the_context():
+    token = CancellationToken()
+    reset = set_current_token(token)
+    try:
+        assert current_token() is token
+    finally:
+        reset_current_token(reset)
+    assert current_token() is None
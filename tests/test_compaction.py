@@ -0,0 +1,62 @@
+from pitch_deck_analyzer.compaction import CHARS_PER_TOKEN, MIN_DIGEST_TOKENS, ContextCompactor, estimate_tokens
+
+
+SEPARATOR = "\n\n----------\n\n"
+
+
+def _report(topic, lines=200):
+    body = [f"## {topic.upper()}"]
+    for number in range(lines):
+        body.append(f"- {topic} fact {number}: revenue grew {number}% to ₹{number} crore")
+        body.append(f"- {topic} risk {number}: customer concentration is a concern")
+        body.append(f"- {topic} filler sentence {number} without anything worth keeping")
+    body.append(f"Overall {topic} score: 7/10")
+    return "\n".join(body)
+
+
+def test_outputs_under_budget_are_joined_unchanged():
+    outputs = [("company", "Short company notes"), ("market", "Short market notes")]
+
+    assert ContextCompactor().compact(outputs, 1000, SEPARATOR) == SEPARATOR.join(text for _, text in outputs)
+
+
+def test_largest_output_is_replaced_first():
+    small = "Team of two founders with 10 years in logistics."
+    large = _report("market")
+    budget = estimate_tokens(small) + 800
+
+    context = ContextCompactor(digest_tokens=500).compact([("company", small), ("market", large)], budget, SEPARATOR)
+
+    company, market = context.split(SEPARATOR)
+    assert company == small
+    assert market.startswith("[DIGEST of market]")
+    assert "score: 7/10" in market
+    assert estimate_tokens(context) <= budget
+
+
+def test_digests_are_shrunk_evenly_when_still_over_budget():
+    outputs = [("company", _report("company")), ("market", _report("market")), ("finance", _report("finance"))]
+    budget = 600
+
+    context = ContextCompactor(digest_tokens=500).compact(outputs, budget, SEPARATOR)
+
+    parts = context.split(SEPARATOR)
+    per_output = max(MIN_DIGEST_TOKENS, budget // len(outputs))
+    assert [part.splitlines()[0] for part in parts] == [f"[DIGEST of {task_id}]" for task_id, _ in outputs]
+    assert all(len(part) <= per_output * CHARS_PER_TOKEN for part in parts)
+
+
+def test_digests_are_built_once_per_distinct_output(monkeypatch):
+    compactor = ContextCompactor()
+    calls = []
+    build = compactor._build_digest
+    monkeypatch.setattr(compactor, "_build_digest", lambda *args: calls.append(args) or build(*args))
+    report = _report("market")
+
+    first = compactor.digest("market", report)
+    second = compactor.digest("market", report)
+    compactor.digest("market", report, 200)
+    compactor.digest("company", report)
+
+    assert first == second
+    assert len(calls) == 3
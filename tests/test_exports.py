@@ -0,0 +1,88 @@
+import json
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from pitch_deck_analyzer.exports import EXPORT_FORMATS, ReportExporter, load_manifest, read_export
+
+
+REPORT = "# Investment Analysis Report\n## Company: Acme\n\n## COMPANY ANALYSIS\n- **Strong** team\n"
+
+
+@pytest.fixture
+def report(tmp_path, monkeypatch):
+    monkeypatch.setenv("PITCH_DECK_REPORTS_DIR", str(tmp_path))
+    path = tmp_path / "acme_analysis_20240101_120000.txt"
+    path.write_text(REPORT, encoding='utf-8')
+    return {"report_path": str(path), "company_name": "Acme", "timestamp": "20240101_120000", "status": "success"}
+
+
+class FinishedExecutor:
+    """Runs work on submit, so the returned future is already done."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def _submit_in_thread(exporter, result):
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.setdefault('future', exporter.submit(result)), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "submit() deadlocked"
+    return outcome['future']
+
+
+def test_submit_does_not_deadlock_when_the_render_fails_at_once(tmp_path):
+    exporter = ReportExporter()
+    exporter._executor = FinishedExecutor()
+
+    future = _submit_in_thread(exporter, {"report_path": str(tmp_path / "missing.txt")})
+
+    assert isinstance(future.exception(), FileNotFoundError)
+    assert exporter._pending == {}
+
+
+def test_submit_of_a_missing_report_returns_promptly(tmp_path):
+    future = _submit_in_thread(ReportExporter(), {"report_path": str(tmp_path / "report_save_failed.txt")})
+
+    with pytest.raises(FileNotFoundError):
+        future.result(5)
+
+
+def test_exports_every_format_once_and_records_a_manifest(report):
+    exporter = ReportExporter()
+
+    exports = exporter.submit(report).result(5)
+
+    assert set(exports) == set(EXPORT_FORMATS)
+    assert read_export(exports['md']).decode('utf-8') == REPORT
+    assert json.loads(read_export(exports['json']))['company_name'] == "Acme"
+    assert read_export(exports['pdf']).startswith(b"%PDF-")
+    assert load_manifest(report['report_path']) == exports
+    assert exporter.ensure(report) == exports
+
+
+def test_identical_reports_share_export_files(report, tmp_path):
+    copy = tmp_path / "acme_copy.txt"
+    copy.write_text(REPORT, encoding='utf-8')
+    exporter = ReportExporter()
+
+    first = exporter.ensure(report)
+    second = exporter.ensure({**report, "report_path": str(copy)})
+
+    assert first['md'].path == second['md'].path
+    assert len(list((tmp_path / "exports").glob("*.md"))) == 1
+
+
+def test_results_without_a_report_have_no_exports():
+    exporter = ReportExporter()
+
+    assert exporter.submit({"status": "error"}) is None
+    assert exporter.ensure({"status": "error"}) == {}
@@ -0,0 +1,72 @@
+import time
+
+from pitch_deck_analyzer.job_queue import CANCELLED, DONE, RUNNING, JobQueue
+
+
+def _queue(tmp_path, **kwargs):
+    return JobQueue(tmp_path / "jobs.sqlite3", wakeup_path=tmp_path / "workers.sock", **kwargs)
+
+
+def test_jobs_are_claimed_once_in_order(tmp_path):
+    queue = _queue(tmp_path)
+    first = queue.enqueue({"company_name": "Acme"})
+    second = queue.enqueue({"company_name": "Globex"})
+
+    job = queue.claim("worker-a")
+    assert (job.id, job.status, job.worker, job.attempts) == (first, RUNNING, "worker-a", 1)
+    assert job.payload == {"company_name": "Acme"}
+    assert queue.claim("worker-b").id == second
+    assert queue.claim("worker-c") is None
+    assert queue.depth() == 0
+
+    queue.complete(first, {"status": "success"})
+    assert queue.get(first).status == DONE
+
+
+def test_stale_running_jobs_are_reclaimed(tmp_path):
+    queue = _queue(tmp_path, stale_after=0.05)
+    job_id = queue.enqueue({})
+    queue.claim("worker-a")
+    time.sleep(0.1)
+
+    job = queue.claim("worker-b")
+
+    assert (job.id, job.worker, job.attempts) == (job_id, "worker-b", 2)
+
+
+def test_heartbeats_keep_running_jobs_from_being_reclaimed(tmp_path):
+    queue = _queue(tmp_path, stale_after=0.5)
+    job_id = queue.enqueue({})
+    queue.claim("worker-a")
+
+    for _ in range(4):
+        time.sleep(0.1)
+        queue.heartbeat(job_id, "worker-a")
+        assert queue.claim("worker-b") is None
+
+    # A worker that lost the job cannot keep it alive
+    time.sleep(0.6)
+    assert queue.claim("worker-b").id == job_id
+    queue.heartbeat(job_id, "worker-a")
+    assert queue.get(job_id).worker == "worker-b"
+
+
+def test_jobs_cancelled_before_claim_never_run(tmp_path):
+    queue = _queue(tmp_path)
+    job_id = queue.enqueue({})
+    queue.cancel(job_id)
+
+    assert queue.is_cancel_requested(job_id)
+    assert queue.claim("worker-a") is None
+    assert queue.get(job_id).status == CANCELLED
+
+
+def test_cancelling_a_running_job_only_flags_it(tmp_path):
+    queue = _queue(tmp_path)
+    job_id = queue.enqueue({})
+    queue.claim("worker-a")
+    queue.cancel(job_id)
+
+    job = queue.get(job_id)
+    assert (job.status, job.cancel_requested) == (RUNNING, True)
+    assert queue.get("missing") is None
@@ -0,0 +1,47 @@
+import threading
+
+from pitch_deck_analyzer.tools import ocr
+from pitch_deck_analyzer.tools.ocr import OCREngine, has_text_layer
+
+
+def test_has_text_layer_needs_enough_characters():
+    assert not has_text_layer("")
+    assert not has_text_layer("  3  ")
+    assert has_text_layer("Our platform connects farmers with retailers")
+
+
+def test_recognized_text_is_cached_by_image(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ocr, "_recognize", lambda data, language: calls.append(data) or f" text of {data.decode()} ")
+    engine = OCREngine(cache_root=tmp_path, max_workers=2)
+
+    assert engine.recognize([b"one", b"two", b"one"]) == ["text of one", "text of two", "text of one"]
+    assert engine.recognize([b"two"]) == ["text of two"]
+    assert sorted(calls) == [b"one", b"two"]
+
+
+def test_concurrent_analyses_share_one_thread_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr, "_recognize", lambda data, language: "text")
+    engine = OCREngine(cache_root=tmp_path, max_workers=2)
+    start = threading.Barrier(8)
+    executors = []
+
+    def analyse(number):
+        start.wait()
+        engine.recognize([f"page {number}".encode()])
+        executors.append(engine._executor)
+
+    threads = [threading.Thread(target=analyse, args=(number,)) for number in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(executor) for executor in executors}) == 1
+
+
+def test_empty_worker_setting_falls_back_to_the_cpu_count(tmp_path, monkeypatch):
+    monkeypatch.setenv("PITCH_DECK_OCR_WORKERS", "")
+    monkeypatch.setattr(ocr.os, "cpu_count", lambda: 3)
+
+    assert OCREngine(cache_root=tmp_path).max_workers == 3
@@ -0,0 +1,74 @@
+import time
+
+from pitch_deck_analyzer.research_cache import DEFAULT_RESEARCH_TTL_HOURS, ResearchCache, detect_sector
+
+
+SKINCARE_DECK = """
+GlowCo is a D2C skincare brand selling direct-to-consumer through its own website.
+The brand reached rapid growth with capital efficiency; we carry 40 SKUs and have a strong
+position in tier-2 cities. Our D2C orders arrive at customers' doors in 48 hours.
+"""
+
+FARM_DECK = """
+KisanLink helps farmers sell crops directly to buyers and connects each FPO to the mandi.
+Farmers get better prices for their crops; we raised capital to arrive in 3 new states
+and carry inventory for the rapid harvest season.
+"""
+
+
+def test_detect_sector_uses_whole_words():
+    assert detect_sector(SKINCARE_DECK) == "ecommerce/d2c"
+    assert detect_sector(FARM_DECK) == "agritech/farm-inputs"
+
+
+def test_detect_sector_ignores_substrings_of_other_words():
+    text = "Rapid capital deployment to carry our position and arrive early. " * 5
+    assert detect_sector(text) is None
+
+
+def test_detect_sector_needs_enough_hits_and_a_clear_margin():
+    assert detect_sector("A UPI payment app.") is None
+    ambiguous = "payments payments payments loans loans loans"
+    assert detect_sector(ambiguous) is None
+    assert detect_sector("UPI payments for merchants, wallet top-ups, and one loan") == "fintech/payments"
+
+
+def test_detect_sector_ignores_investment_report_wording():
+    analysis = """
+## INVESTMENT HIGHLIGHTS
+PeopleFlow sells HR software to mid-size companies on an annual subscription with an open API.
+The investment ask is INR 20 crore; the investment thesis rests on brand strength and career
+growth features. Key investment risks: credit terms for large customers and data policy changes.
+## INVESTMENT DECISION
+We recommend the investment subject to a review of the subscription pricing policy.
+"""
+    assert detect_sector(analysis) is None
+
+
+def test_empty_ttl_setting_uses_the_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESEARCH_CACHE_TTL_HOURS", "")
+    cache = ResearchCache(root_dir=str(tmp_path))
+    assert cache.ttl_seconds == DEFAULT_RESEARCH_TTL_HOURS * 3600
+
+
+def test_research_round_trip_and_expiry(tmp_path):
+    cache = ResearchCache(root_dir=str(tmp_path), ttl_hours=1)
+    assert cache.get_research("fintech/payments", "india_market_research_task") is None
+
+    cache.put_research("fintech/payments", "india_market_research_task", "UPI volumes keep growing")
+    entry = cache.get_research("fintech/payments", "india_market_research_task")
+    assert entry["content"] == "UPI volumes keep growing"
+    assert cache.get_research("fintech/lending", "india_market_research_task") is None
+
+    expired = ResearchCache(root_dir=str(tmp_path), ttl_hours=1)
+    expired.ttl_seconds = 0
+    time.sleep(0.01)
+    assert expired.get_research("fintech/payments", "india_market_research_task") is None
+
+
+def test_search_results_are_keyed_by_normalized_query(tmp_path):
+    cache = ResearchCache(root_dir=str(tmp_path))
+    cache.put_search("search", {"search_query": "UPI  Market Size"}, "results")
+
+    assert cache.get_search("search", {"search_query": "upi market size"}) == "results"
+    assert cache.get_search("other_tool", {"search_query": "upi market size"}) is None
@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from pitch_deck_analyzer.cancellation import CancellationToken  # noqa: E402
+from pitch_deck_analyzer.llm_pool import LLMSpec  # noqa: E402
+from pitch_deck_analyzer.scheduler import TIMEOUT_BUCKET_SECONDS, TaskPlan, TaskScheduler  # noqa: E402
+
+
+class RecordingPool:
+    """Stands in for LLMPool, remembering which specs were asked for."""
+
+    def __init__(self):
+        self.specs = []
+
+    def get(self, spec):
+        self.specs.append(spec)
+        return spec
+
+
+@pytest.mark.parametrize("remaining", [0.5, 5.5, 14.9, 15.2, 44.0, 100.0])
+def test_deadline_capped_timeouts_never_exceed_the_remaining_time(monkeypatch, remaining):
+    pool = RecordingPool()
+    scheduler = TaskScheduler(pool, lambda agent_id, llm: (agent_id, llm))
+    monkeypatch.setattr(TaskScheduler, "_invoke", staticmethod(lambda plan, agent, context: "done"))
+    plan = TaskPlan(task_id="market", agent_id="analyst", task=None, spec=LLMSpec(timeout=120))
+    token = CancellationToken(deadline=time.time() + remaining)
+
+    assert scheduler._execute(plan, plan.spec, None, token) == "done"
+
+    timeout = pool.specs[-1].timeout
+    assert 1 <= timeout <= max(1.0, remaining)
+    if remaining >= TIMEOUT_BUCKET_SECONDS:
+        assert timeout % TIMEOUT_BUCKET_SECONDS == 0
+    else:
+        assert timeout == int(timeout)
+
+
+def test_timeouts_are_left_alone_without_a_deadline(monkeypatch):
+    pool = RecordingPool()
+    scheduler = TaskScheduler(pool, lambda agent_id, llm: (agent_id, llm))
+    monkeypatch.setattr(TaskScheduler, "_invoke", staticmethod(lambda plan, agent, context: "done"))
+    plan = TaskPlan(task_id="market", agent_id="analyst", task=None, spec=LLMSpec(timeout=120))
+
+    scheduler._execute(plan, plan.spec, None, CancellationToken())
+
+    assert pool.specs == [plan.spec]
@@ -0,0 +1,83 @@
+from pitch_deck_analyzer.tools.text_normalizer import normalize_pages
+
+
+FOOTER = "Acme Corp | Confidential | Page {n}"
+
+
+def _deck(*bodies):
+    return [f"{body}\n{FOOTER.format(n=number)}" for number, body in enumerate(bodies, start=1)]
+
+
+def test_removes_footers_and_page_numbers():
+    pages = _deck(
+        "Acme helps farmers sell crops directly to retailers.",
+        "Our team has built three marketplaces before.",
+        "We grew gross merchandise value every quarter this year.",
+        "We are raising a seed round to expand to five states.",
+    )
+    pages[0] += "\n1 / 4"
+
+    cleaned, stats = normalize_pages(pages)
+
+    assert all("Confidential" not in page for page in cleaned)
+    assert "1 / 4" not in cleaned[0]
+    assert cleaned[1] == "Our team has built three marketplaces before."
+    assert stats.repeated_lines_removed == 4
+    assert stats.tokens_saved > 0
+
+
+def test_keeps_numeric_lines_that_vary_between_slides():
+    pages = _deck(
+        "Acme helps farmers sell crops directly to retailers.",
+        "Revenue: $2M ARR",
+        "Revenue: $3M ARR",
+        "We are raising a seed round to expand to five states.",
+    )
+
+    cleaned, _ = normalize_pages(pages)
+
+    assert cleaned[1] == "Revenue: $2M ARR"
+    assert cleaned[2] == "Revenue: $3M ARR"
+
+
+def test_keeps_content_repeated_on_two_slides_of_a_short_deck():
+    pages = ["Intro slide text", "Revenue: $2M ARR", "Revenue: $2M ARR\nTeam slide", "Closing slide"]
+
+    cleaned, stats = normalize_pages(pages)
+
+    assert "Revenue: $2M ARR" in cleaned[1]
+    assert "Revenue: $2M ARR" in cleaned[2]
+    assert stats.repeated_lines_removed == 0
+
+
+def test_drops_near_duplicate_slides():
+    body = (
+        "Our platform connects smallholder farmers with modern retail chains across India, "
+        "cutting out four layers of intermediaries and raising farmer income by a third "
+        "while giving retailers fresher produce at lower prices every single day"
+    )
+    pages = [body, "Team: two founders with a decade in agritech logistics and retail.", body + "."]
+
+    cleaned, stats = normalize_pages(pages)
+
+    assert cleaned[0] == body
+    assert cleaned[2] == ""
+    assert stats.duplicate_pages_removed == 1
+    assert len(cleaned) == 3
+
+
+def test_keeps_standalone_metric_lines():
+    pages = ["Our traction\n500\nenterprise customers", "Our team\n12\nengineers", "Closing slide\n3"]
+
+    cleaned, _ = normalize_pages(pages)
+
+    assert cleaned[0] == "Our traction\n500\nenterprise customers"
+    assert cleaned[1] == "Our team\n12\nengineers"
+
+
+def test_drops_bare_page_numbers_that_follow_the_page_sequence():
+    pages = ["Intro\n1", "Problem\n2", "Solution\n3", "Traction\n500\n4"]
+
+    cleaned, _ = normalize_pages(pages)
+
+    assert cleaned == ["Intro", "Problem", "Solution", "Traction\n500"]